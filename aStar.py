@@ -1,11 +1,55 @@
 import heapq
+import numpy as np
+
+class SearchWorkspace:
+    """
+    Buffers reaproveitados entre buscas sobre a mesma grade
+    g/parent só valem para nós cujo carimbo `visited` é igual à geração
+    atual, então iniciar uma nova busca custa O(1): basta incrementar a
+    geração (e esvaziar o heap reaproveitado).
+    """
+
+    MAX_GENERATION = np.iinfo(np.uint32).max
+
+    def __init__(self, size):
+        self.size = size
+        self.g = np.zeros(size, dtype=np.int64)
+        self.parent = np.zeros(size, dtype=np.int64)
+        self.visited = np.zeros(size, dtype=np.uint32)
+        self.closed = np.zeros(size, dtype=np.uint32)
+        self.generation = 0
+        self.heap = []
+
+        self.g_view = memoryview(self.g)
+        self.parent_view = memoryview(self.parent)
+        self.visited_view = memoryview(self.visited)
+        self.closed_view = memoryview(self.closed)
+
+    def begin(self):
+        """Invalida os dados da busca anterior e retorna a nova geração"""
+        self.generation += 1
+        if self.generation > self.MAX_GENERATION:
+            # Estouro do carimbo (raro): aí sim limpa tudo, em O(N)
+            self.visited.fill(0)
+            self.closed.fill(0)
+            self.generation = 1
+        self.heap.clear()
+        return self.generation
+
 
 class AStar:
+    # Ordem das tabelas JPS+: cima, baixo, esquerda, direita
+    JPS_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    # Acima disso, search_nearest usa Dijkstra (h = 0)
+    MAX_HEURISTIC_GOALS = 16
+    # Custo de entrar em cada código de Maze.cells (livre, obstáculo, parede, start, end)
+    CELL_COSTS = np.array([1, 3, 1, 1, 1], dtype=np.uint8)
+
     def __init__(self, maze):
         """Inicializa o A* com um objeto maze"""
+        self.maze = maze
         self.rows = maze.rows
         self.cols = maze.cols
-        self.grid = maze.grid
         self.start = maze.start
         self.end = maze.end
         self.FREE = maze.FREE
@@ -13,28 +57,31 @@ class AStar:
         self.WALL = maze.WALL
         self.START = maze.START 
         self.END = maze.END
+        self._workspace = None
+        # Lista: indexada pelo código uint8 sem passar pelo NumPy
+        self._cell_costs = self.CELL_COSTS.tolist()
 
     def heuristic(self, pos1, pos2):
         """Calcula a heurística (distância de Manhattan)"""
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
     
+    @property
+    def grid(self):
+        """Visão em caracteres do maze (criada sob demanda no modo compacto)"""
+        return self.maze.grid
+
+    @property
+    def adjacency(self):
+        """Tabela de adjacência do maze (construída uma vez e compartilhada pelas buscas)"""
+        return self.maze.adjacency
+
     def get_neighbors(self, node):
         """Retorna os vizinhos válidos de um nó"""
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # cima, baixo, esquerda, direita
-        neighbors = []
-        
-        for dr, dc in directions:
-            new_row, new_col = node[0] + dr, node[1] + dc
-            
-            # Verifica se está dentro dos limites
-            if (0 <= new_row < self.rows and 0 <= new_col < self.cols):
-                cell = self.grid[new_row][new_col]
-                # Para A* com custos, permite movimento através de obstáculos
-                # Apenas paredes são realmente intransponíveis
-                if cell != self.WALL:
-                    neighbors.append((new_row, new_col))
-        
-        return neighbors
+        # Para A* com custos, obstáculos são transitáveis; apenas paredes
+        # ficam fora da tabela de adjacência
+        cols = self.cols
+        return [divmod(neighbor, cols)
+                for neighbor, _ in self.adjacency.neighbors(node[0] * cols + node[1])]
     
     def get_movement_cost(self, from_pos, to_pos):
         """
@@ -42,15 +89,9 @@ class AStar:
         - Espaços livres: custo 1
         - Obstáculos: custo 3 (mais caro, mas possível)
         - Start/End: custo 1
+        Lido dos códigos de maze.cells: não cria a visão em caracteres
         """
-        target_cell = self.grid[to_pos[0]][to_pos[1]]
-        
-        if target_cell == self.OBSTACLE:
-            return 3  # Custo alto para passar por obstáculos
-        elif target_cell in [self.FREE, self.START, self.END]:
-            return 1  # Custo normal para espaços livres
-        else:
-            return 1  # Custo padrão para outros casos
+        return self._cell_costs[self.maze.cells[to_pos[0], to_pos[1]]]
         
     def search(self):
         """
@@ -129,6 +170,169 @@ class AStar:
         # Se OPEN SET está vazio e não chegamos ao objetivo, não há caminho
         return False, [], float('inf'), nodes_explored
     
+    def workspace(self, size):
+        """Workspace persistente deste A* (realocado só se o tamanho da grade mudar)"""
+        if self._workspace is None or self._workspace.size != size:
+            self._workspace = SearchWorkspace(size)
+        return self._workspace
+
+    def search_array(self, start=None, goal=None, adjacency=None):
+        """
+        A* sobre índices planos (row * cols + col) com vetores NumPy
+        Usa a tabela de adjacência do maze (ou a informada) no lugar de
+        get_neighbors/get_movement_cost. start/goal padrão: maze.start/maze.end
+        Os buffers vêm do workspace persistente: consultas repetidas não
+        alocam nem limpam memória O(N)
+        Retorna: (caminho_encontrado, caminho, custo_total, nós_explorados)
+        """
+        start_pos = self.start if start is None else start
+        goal_pos = self.end if goal is None else goal
+        if start_pos == goal_pos:
+            return True, [start_pos], 0, 1
+
+        if adjacency is None:
+            adjacency = self.adjacency
+
+        cols = adjacency.cols
+        n = adjacency.size
+        start = start_pos[0] * cols + start_pos[1]
+        goal = goal_pos[0] * cols + goal_pos[1]
+        goal_row, goal_col = goal_pos
+
+        ws = self.workspace(n)
+        generation = ws.begin()
+
+        # memoryview devolve ints Python, bem mais rápido que indexar o array
+        indices = adjacency.indices_view
+        weights = adjacency.weights_view
+        g_score = ws.g_view
+        parent = ws.parent_view
+        visited = ws.visited_view
+        closed = ws.closed_view
+
+        g_score[start] = 0
+        visited[start] = generation
+        open_set = ws.heap
+        open_set.append((abs(start_pos[0] - goal_row) + abs(start_pos[1] - goal_col), start))
+        nodes_explored = 0
+
+        while open_set:
+            current_f, current = heapq.heappop(open_set)
+
+            # Ignora entradas desatualizadas no heap
+            if closed[current] == generation:
+                continue
+
+            row, col = divmod(current, cols)
+            current_g = g_score[current]
+            if current_f > current_g + abs(row - goal_row) + abs(col - goal_col):
+                continue
+
+            closed[current] = generation
+            nodes_explored += 1
+
+            if current == goal:
+                path = []
+                while current != start:
+                    path.append(divmod(current, cols))
+                    current = parent[current]
+                path.append(start_pos)
+                path.reverse()
+                return True, path, current_g, nodes_explored
+
+            base = current * 4
+            for k in range(base, base + 4):
+                neighbor = indices[k]
+                if neighbor < 0 or closed[neighbor] == generation:
+                    continue
+
+                tentative_g_score = current_g + weights[k]
+                if visited[neighbor] != generation or tentative_g_score < g_score[neighbor]:
+                    visited[neighbor] = generation
+                    parent[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    n_row, n_col = divmod(neighbor, cols)
+                    heapq.heappush(open_set, (tentative_g_score + abs(n_row - goal_row) + abs(n_col - goal_col), neighbor))
+
+        return False, [], float('inf'), nodes_explored
+
+    def search_nearest(self, goals, start=None, adjacency=None):
+        """
+        Busca multi-objetivo: em uma única busca, encontra o objetivo alcançável
+        com menor custo real de caminho (não o mais próximo em Manhattan)
+        h(n) = menor Manhattan até os objetivos (consistente); com muitos
+        objetivos vira Dijkstra (h = 0) para não pagar O(K) por nó
+        Retorna: (caminho_encontrado, objetivo, caminho, custo_total, nós_explorados)
+        """
+        start_pos = self.start if start is None else start
+        goals = list(goals)
+        if not goals:
+            return False, None, [], float('inf'), 0
+        if start_pos in goals:
+            return True, start_pos, [start_pos], 0, 1
+
+        if adjacency is None:
+            adjacency = self.adjacency
+
+        cols = adjacency.cols
+        start = start_pos[0] * cols + start_pos[1]
+        goal_set = {row * cols + col for row, col in goals}
+        use_heuristic = len(goals) <= self.MAX_HEURISTIC_GOALS
+
+        def heuristic(node):
+            if not use_heuristic:
+                return 0
+            row, col = divmod(node, cols)
+            return min(abs(row - goal_row) + abs(col - goal_col) for goal_row, goal_col in goals)
+
+        ws = self.workspace(adjacency.size)
+        generation = ws.begin()
+        indices = adjacency.indices_view
+        weights = adjacency.weights_view
+        g_score = ws.g_view
+        parent = ws.parent_view
+        visited = ws.visited_view
+        closed = ws.closed_view
+
+        g_score[start] = 0
+        visited[start] = generation
+        open_set = ws.heap
+        open_set.append((heuristic(start), start))
+        nodes_explored = 0
+
+        while open_set:
+            current_f, current = heapq.heappop(open_set)
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
+            nodes_explored += 1
+
+            current_g = g_score[current]
+            if current in goal_set:
+                goal = divmod(current, cols)
+                path = []
+                while current != start:
+                    path.append(divmod(current, cols))
+                    current = parent[current]
+                path.append(start_pos)
+                path.reverse()
+                return True, goal, path, current_g, nodes_explored
+
+            base = current * 4
+            for k in range(base, base + 4):
+                neighbor = indices[k]
+                if neighbor < 0 or closed[neighbor] == generation:
+                    continue
+
+                tentative_g_score = current_g + weights[k]
+                if visited[neighbor] != generation or tentative_g_score < g_score[neighbor]:
+                    visited[neighbor] = generation
+                    parent[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor), neighbor))
+
+        return False, None, [], float('inf'), nodes_explored
+
     def search_with_callback(self, callback=None, max_steps=2000):
         """
         A* rigoroso com callback para visualização seguindo regras acadêmicas
@@ -217,14 +421,16 @@ class AStar:
         if self.start == self.end:
             return True, [self.start], 0, 1
         
-        heap = [(self.heuristic(self.start, self.end), 0, self.start, [self.start])]
+        # O heap guarda só o nó; o caminho é reconstruído por ponteiros de pai
+        heap = [(self.heuristic(self.start, self.end), 0, self.start)]
         g_scores = {self.start: 0}
         f_scores = {self.start: self.heuristic(self.start, self.end)}
+        came_from = {}
         visited = set()
         nodes_explored = 0
         
         while heap:
-            f_score, g_score, current_pos, path = heapq.heappop(heap)
+            f_score, g_score, current_pos = heapq.heappop(heap)
             
             # Se já foi visitado ou temos f-score melhor, pula
             if current_pos in visited:
@@ -237,6 +443,11 @@ class AStar:
             nodes_explored += 1
             
             if current_pos == self.end:
+                path = [current_pos]
+                while current_pos in came_from:
+                    current_pos = came_from[current_pos]
+                    path.append(current_pos)
+                path.reverse()
                 return True, path, g_score, nodes_explored
             
             # Para busca simples, só considera vizinhos livres
@@ -253,27 +464,228 @@ class AStar:
                         # Só adiciona se f-score for melhor
                         if neighbor not in f_scores or tentative_f_score < f_scores[neighbor]:
                             f_scores[neighbor] = tentative_f_score
-                            new_path = path + [neighbor]
-                            heapq.heappush(heap, (tentative_f_score, tentative_g_score, neighbor, new_path))
+                            came_from[neighbor] = current_pos
+                            heapq.heappush(heap, (tentative_f_score, tentative_g_score, neighbor))
         
         return False, [], float('inf'), nodes_explored
     
+    def search_bidirectional(self, simple=False):
+        """
+        A* bidirecional: busca a partir de maze.start e de maze.end ao mesmo tempo
+        simple=False: custos de search() (obstáculos custam 3)
+        simple=True: regras de search_simple() (obstáculos são barreiras)
+        Para quando o topo de uma das filas não pode mais melhorar o melhor
+        encontro (heurísticas consistentes)
+        Retorna: (caminho_encontrado, caminho, custo_total, nós_explorados)
+        """
+        if self.start == self.end:
+            return True, [self.start], 0, 1
+
+        adjacency = self.adjacency
+        cols = self.cols
+        costs = adjacency.costs_view
+
+        def index(pos):
+            return pos[0] * cols + pos[1]
+
+        # Lado 0: a partir do start (g = custo start→n)
+        # Lado 1: a partir do end (g = custo n→end; aresta n→m custa o custo de m)
+        targets = (self.end, self.start)
+        g_scores = ({self.start: 0}, {self.end: 0})
+        came_from = ({}, {})
+        closed_sets = (set(), set())
+        open_sets = ([(self.heuristic(self.start, self.end), self.start)],
+                     [(self.heuristic(self.end, self.start), self.end)])
+
+        best_cost = float('inf')
+        meeting = None
+        nodes_explored = 0
+
+        while open_sets[0] and open_sets[1]:
+            if open_sets[0][0][0] >= best_cost or open_sets[1][0][0] >= best_cost:
+                break
+
+            # Expande o lado com a fronteira menor
+            side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+            open_set, closed_set = open_sets[side], closed_sets[side]
+            g_score, other_g = g_scores[side], g_scores[1 - side]
+
+            current_f, current = heapq.heappop(open_set)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+            nodes_explored += 1
+
+            current_cost = costs[index(current)]
+            for neighbor_index, neighbor_cost in adjacency.neighbors(index(current)):
+                if simple and neighbor_cost != 1:
+                    continue
+                neighbor = divmod(neighbor_index, cols)
+                if neighbor in closed_set:
+                    continue
+
+                step = neighbor_cost if side == 0 else current_cost
+                tentative_g_score = g_score[current] + step
+                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                    g_score[neighbor] = tentative_g_score
+                    came_from[side][neighbor] = current
+                    heapq.heappush(open_set, (tentative_g_score + self.heuristic(neighbor, targets[side]), neighbor))
+
+                    # As duas buscas se encontraram: candidato a melhor caminho
+                    if neighbor in other_g and tentative_g_score + other_g[neighbor] < best_cost:
+                        best_cost = tentative_g_score + other_g[neighbor]
+                        meeting = neighbor
+
+        if meeting is None:
+            return False, [], float('inf'), nodes_explored
+
+        path = [meeting]
+        node = meeting
+        while node in came_from[0]:
+            node = came_from[0][node]
+            path.append(node)
+        path.reverse()
+        node = meeting
+        while node in came_from[1]:
+            node = came_from[1][node]
+            path.append(node)
+        return True, path, best_cost, nodes_explored
+    
     def get_simple_neighbors(self, node):
         """Retorna apenas vizinhos livres (sem obstáculos ou paredes)"""
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        neighbors = []
-        
-        for dr, dc in directions:
-            new_row, new_col = node[0] + dr, node[1] + dc
-            
-            if (0 <= new_row < self.rows and 0 <= new_col < self.cols):
-                cell = self.grid[new_row][new_col]
-                # Só aceita espaços livres, start e end
-                if cell in [self.FREE, self.START, self.END]:
-                    neighbors.append((new_row, new_col))
-        
-        return neighbors
+        # Na tabela de adjacência, custo 1 = espaço livre, start ou end
+        cols = self.cols
+        return [divmod(neighbor, cols)
+                for neighbor, cost in self.adjacency.neighbors(node[0] * cols + node[1]) if cost == 1]
     
+    def _jump(self, node, direction, goal, jump_distances, cols):
+        """
+        Salta na direção dada usando as tabelas JPS+ (4-conectado)
+        Retorna o próximo ponto de salto (ou o objetivo) ou None se bater em parede/borda
+        """
+        row, col = node
+        dr, dc = direction
+        goal_row, goal_col = goal
+        distance = jump_distances[self.JPS_DIRECTIONS.index(direction)][row * cols + col]
+        reach = distance if distance > 0 else -distance
+
+        if dc != 0:
+            steps = (goal_col - col) * dc
+            if goal_row == row and 0 < steps <= reach:
+                return goal
+        else:
+            steps = (goal_row - row) * dr
+            if 0 < steps <= reach:
+                if goal_col == col:
+                    return goal
+                # Na linha do objetivo, para se o salto horizontal o alcança
+                side = 2 if goal_col < col else 3
+                horizontal = jump_distances[side][goal_row * cols + col]
+                if abs(goal_col - col) <= (horizontal if horizontal > 0 else -horizontal):
+                    return (goal_row, col)
+
+        if distance > 0:
+            return (row + dr * distance, col + dc * distance)
+        return None
+
+    def _jps_directions(self, node, parent, walkable):
+        """Direções podadas a partir de um nó, dada a direção de chegada"""
+        row, col = node
+        if parent is None:
+            candidates = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        else:
+            dr = (row > parent[0]) - (row < parent[0])
+            dc = (col > parent[1]) - (col < parent[1])
+            if dc != 0:
+                candidates = [(-1, 0), (1, 0), (0, dc)]
+            else:
+                candidates = [(0, -1), (0, 1), (dr, 0)]
+        return [(dr, dc) for dr, dc in candidates if walkable(row + dr, col + dc)]
+
+    def search_jps(self, start=None, goal=None, adjacency=None):
+        """
+        Jump Point Search (JPS+) para grades de custo uniforme (mesmas regras de
+        search_simple: só espaços livres, start e end são transitáveis)
+        Expande apenas pontos de salto, pulando os nós simétricos em áreas abertas;
+        as distâncias de salto vêm pré-calculadas da tabela de adjacência
+        Retorna: (caminho_encontrado, caminho, custo_total, nós_explorados)
+        """
+        start = self.start if start is None else start
+        goal = self.end if goal is None else goal
+        if start == goal:
+            return True, [start], 0, 1
+
+        if adjacency is None:
+            adjacency = self.adjacency
+        rows, cols = adjacency.rows, adjacency.cols
+        costs = adjacency.costs_view
+        jump_distances = adjacency.jump_distances()
+
+        def walkable(row, col):
+            return 0 <= row < rows and 0 <= col < cols and costs[row * cols + col] == 1
+
+        open_set = [(self.heuristic(start, goal), start)]
+        g_score = {start: 0}
+        came_from = {}
+        closed_set = set()
+        nodes_explored = 0
+
+        while open_set:
+            current_f, current = heapq.heappop(open_set)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+            nodes_explored += 1
+
+            if current == goal:
+                # Reconstrói o caminho completo ligando os pontos de salto em linha reta
+                jump_points = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    jump_points.append(current)
+                jump_points.reverse()
+
+                path = [start]
+                for (r1, c1), (r2, c2) in zip(jump_points, jump_points[1:]):
+                    dr = (r2 > r1) - (r2 < r1)
+                    dc = (c2 > c1) - (c2 < c1)
+                    for step in range(1, abs(r2 - r1) + abs(c2 - c1) + 1):
+                        path.append((r1 + dr * step, c1 + dc * step))
+                return True, path, g_score[goal], nodes_explored
+
+            for direction in self._jps_directions(current, came_from.get(current), walkable):
+                jump_point = self._jump(current, direction, goal, jump_distances, cols)
+                if jump_point is None or jump_point in closed_set:
+                    continue
+
+                tentative_g_score = g_score[current] + self.heuristic(current, jump_point)
+                if jump_point not in g_score or tentative_g_score < g_score[jump_point]:
+                    came_from[jump_point] = current
+                    g_score[jump_point] = tentative_g_score
+                    heapq.heappush(open_set, (tentative_g_score + self.heuristic(jump_point, goal), jump_point))
+
+        return False, [], float('inf'), nodes_explored
+
+    def compare_jps(self):
+        """Compara nós explorados do JPS com o A* simples (custo uniforme)"""
+        print("🔍 Comparando A* simples com Jump Point Search:")
+
+        found1, path1, cost1, nodes1 = self.search_simple()
+        found2, path2, cost2, nodes2 = self.search_jps()
+
+        print(f"A* simples: {'✓' if found1 else '✗'} | "
+              f"Custo: {cost1 if found1 else '∞'} | "
+              f"Nós: {nodes1}")
+
+        print(f"JPS:        {'✓' if found2 else '✗'} | "
+              f"Custo: {cost2 if found2 else '∞'} | "
+              f"Nós: {nodes2}")
+
+        if found1 and found2 and nodes2 > 0:
+            print(f"📉 JPS explorou {nodes1 / nodes2:.1f}x menos nós")
+
+        return (found1, cost1, nodes1), (found2, cost2, nodes2)
+
     def visualize_path_with_costs(self, path):
         """Visualiza o caminho encontrado mostrando os custos"""
         if not path:
@@ -281,7 +693,7 @@ class AStar:
             return
         
         # Cria uma cópia do grid para visualização
-        visual_grid = self.grid.copy()
+        visual_grid = self.maze.CELL_CHARS[self.maze.cells]
         total_cost = 0
         
         # Marca o caminho e calcula custo total
@@ -314,8 +726,8 @@ class AStar:
             cost = self.get_movement_cost(from_pos, to_pos)
             heuristic_cost = self.heuristic(to_pos, self.end)  
             total_cost = cost + heuristic_cost
-            cell_type = self.grid[to_pos[0]][to_pos[1]]
-            cell_name = 'obstáculo' if cell_type == self.OBSTACLE else 'livre'
+            cell_type = self.maze.cells[to_pos[0], to_pos[1]]
+            cell_name = 'obstáculo' if cell_type == self.maze.CELL_OBSTACLE else 'livre'
             print(f"  {from_pos} → {to_pos}: custo total {total_cost} ({cell_name})")
         print()
     
@@ -0,0 +1,182 @@
+import numpy as np
+
+
+def _next_along_rows(mask, fill):
+    """Para cada célula, o menor índice de coluna k > c com mask[r, k] (ou fill)"""
+    cols = mask.shape[1]
+    idx = np.where(mask, np.arange(cols), fill)
+    suffix = np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+    result = np.full_like(suffix, fill)
+    result[:, :-1] = suffix[:, 1:]
+    return result
+
+
+def _jump_distance_along_rows(marker, walkable):
+    """
+    Distância, andando para a direita, até a primeira célula marcada antes
+    de uma parede (> 0), ou -(passos livres até a parede) se não houver
+    """
+    cols = walkable.shape[1]
+    next_marker = _next_along_rows(marker & walkable, 2 * cols)
+    next_block = _next_along_rows(~walkable, cols)
+    col = np.arange(cols)
+    return np.where(next_marker < next_block, next_marker - col, -(next_block - col - 1)).astype(np.int32)
+
+
+def _oriented(func, direction, *arrays):
+    """Aplica func como se o movimento fosse para a direita (gira/espelha os arrays)"""
+    dr, dc = direction
+    if dr != 0:
+        arrays = [a.T for a in arrays]
+    if dr < 0 or dc < 0:
+        arrays = [a[:, ::-1] for a in arrays]
+    result = func(*arrays)
+    if dr < 0 or dc < 0:
+        result = result[:, ::-1]
+    if dr != 0:
+        result = result.T
+    return np.ascontiguousarray(result)
+
+
+def build_jump_distances(walkable):
+    """
+    Tabelas JPS+ (4-conectado) com a distância até o próximo ponto de salto em
+    cada direção (cima, baixo, esquerda, direita), independentes do objetivo
+    Valor > 0: ponto de salto a essa distância; valor <= 0: -(passos até a parede)
+    """
+    padded = np.pad(walkable, 1, constant_values=False)
+    center = padded[1:-1, 1:-1]
+    up, down = padded[:-2, 1:-1], padded[2:, 1:-1]
+    left, right = padded[1:-1, :-2], padded[1:-1, 2:]
+    up_left, up_right = padded[:-2, :-2], padded[:-2, 2:]
+    down_left, down_right = padded[2:, :-2], padded[2:, 2:]
+
+    # Vizinhos forçados: a célula ao lado abre logo depois de estar bloqueada
+    forced = {
+        (0, 1): center & ((up & ~up_left) | (down & ~down_left)),
+        (0, -1): center & ((up & ~up_right) | (down & ~down_right)),
+        (1, 0): center & ((left & ~up_left) | (right & ~up_right)),
+        (-1, 0): center & ((left & ~down_left) | (right & ~down_right)),
+    }
+
+    horizontal = {d: _oriented(_jump_distance_along_rows, d, forced[d], walkable)
+                  for d in ((0, -1), (0, 1))}
+    # Na vertical, também para onde um salto horizontal encontra ponto de salto
+    horizontal_jump = (horizontal[(0, -1)] > 0) | (horizontal[(0, 1)] > 0)
+    vertical = {d: _oriented(_jump_distance_along_rows, d, forced[d] | horizontal_jump, walkable)
+                for d in ((-1, 0), (1, 0))}
+
+    return [vertical[(-1, 0)].ravel(), vertical[(1, 0)].ravel(),
+            horizontal[(0, -1)].ravel(), horizontal[(0, 1)].ravel()]
+
+
+class GridAdjacency:
+    """
+    Tabela de adjacência compacta (estilo CSR) de uma grade 4-conectada
+
+    Cada célula tem 4 posições fixas (cima, baixo, esquerda, direita) em
+    `indices`/`weights`, começando em `indptr[i]`. Posições sem aresta têm
+    índice -1 e peso 0. O passo fixo permite atualizar uma célula no lugar,
+    sem reconstruir a tabela.
+    """
+
+    # cima, baixo, esquerda, direita (mesma ordem de AStar.get_neighbors)
+    DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    DEGREE = 4
+    # Arrays que definem a tabela (ver arrays/from_arrays)
+    ARRAYS = ('costs', 'indptr', 'indices', 'weights')
+
+    def __init__(self, costs):
+        """
+        costs: matriz (rows, cols) com o custo de entrar em cada célula
+        (0 = intransponível)
+        """
+        costs = np.asarray(costs, dtype=np.int32)
+        self.rows, self.cols = costs.shape
+        self.size = self.rows * self.cols
+        self.costs = costs.ravel().copy()
+        self.indptr = np.arange(0, self.DEGREE * self.size + 1, self.DEGREE, dtype=np.int64)
+        self.indices = np.full(self.DEGREE * self.size, -1, dtype=np.int32)
+        self.weights = np.zeros(self.DEGREE * self.size, dtype=np.int32)
+        self._build()
+        self._init_views()
+        self._jump_distances = None
+
+    @classmethod
+    def from_arrays(cls, rows, cols, arrays, jump_distances=None):
+        """
+        Tabela sobre arrays já montados (dicionário com ARRAYS, por exemplo em
+        memória compartilhada), sem copiá-los; jump_distances: tabelas JPS+ prontas
+        """
+        adjacency = cls.__new__(cls)
+        adjacency.rows, adjacency.cols = rows, cols
+        adjacency.size = rows * cols
+        for name in cls.ARRAYS:
+            setattr(adjacency, name, arrays[name])
+        adjacency._init_views()
+        adjacency._jump_distances = None if jump_distances is None else [memoryview(d) for d in jump_distances]
+        return adjacency
+
+    def _init_views(self):
+        """memoryviews devolvem ints Python: acesso rápido dentro dos laços de busca"""
+        self.indices_view = memoryview(self.indices)
+        self.weights_view = memoryview(self.weights)
+        self.costs_view = memoryview(self.costs)
+
+    def arrays(self):
+        """Os arrays de ARRAYS, por nome (o inverso de from_arrays)"""
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    def _build(self):
+        """Monta todas as arestas de uma vez com operações vetorizadas"""
+        rows, cols = self.rows, self.cols
+        idx = np.arange(self.size, dtype=np.int32).reshape(rows, cols)
+        indices = self.indices.reshape(rows, cols, self.DEGREE)
+        indices[1:, :, 0] = idx[:-1, :]
+        indices[:-1, :, 1] = idx[1:, :]
+        indices[:, 1:, 2] = idx[:, :-1]
+        indices[:, :-1, 3] = idx[:, 1:]
+
+        self.weights[:] = np.where(self.indices >= 0, self.costs[self.indices], 0)
+        self.indices[self.weights == 0] = -1
+
+    def _patch_node(self, node):
+        """Recalcula as 4 posições de um nó"""
+        row, col = divmod(node, self.cols)
+        base = self.indptr[node]
+        for k, (dr, dc) in enumerate(self.DIRECTIONS):
+            n_row, n_col = row + dr, col + dc
+            neighbor = n_row * self.cols + n_col
+            if 0 <= n_row < self.rows and 0 <= n_col < self.cols and self.costs[neighbor] > 0:
+                self.indices[base + k] = neighbor
+                self.weights[base + k] = self.costs[neighbor]
+            else:
+                self.indices[base + k] = -1
+                self.weights[base + k] = 0
+
+    def update_cell(self, row, col, cost):
+        """Atualiza o custo de uma célula e corrige as arestas afetadas no lugar"""
+        self.costs[row * self.cols + col] = cost
+        self._jump_distances = None
+        # Só as arestas que entram na célula mudam: ficam nos seus 4 vizinhos
+        for dr, dc in self.DIRECTIONS:
+            n_row, n_col = row + dr, col + dc
+            if 0 <= n_row < self.rows and 0 <= n_col < self.cols:
+                self._patch_node(n_row * self.cols + n_col)
+
+    def neighbors(self, node):
+        """Retorna [(vizinho, custo)] de um nó (índice plano)"""
+        base = node * self.DEGREE
+        indices = self.indices_view[base:base + self.DEGREE].tolist()
+        weights = self.weights_view[base:base + self.DEGREE].tolist()
+        return [(neighbor, cost) for neighbor, cost in zip(indices, weights) if neighbor >= 0]
+
+    def jump_distances(self):
+        """
+        Tabelas JPS+ para a grade de custo uniforme (só células de custo 1),
+        calculadas uma vez e refeitas após update_cell
+        """
+        if self._jump_distances is None:
+            walkable = (self.costs == 1).reshape(self.rows, self.cols)
+            self._jump_distances = [memoryview(d) for d in build_jump_distances(walkable)]
+        return self._jump_distances
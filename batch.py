@@ -0,0 +1,124 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory, util
+
+import numpy as np
+
+from aStar import AStar
+from adjacency import GridAdjacency
+from maze import Maze
+
+
+def _share_arrays(arrays):
+    """
+    Copia os arrays (nome → array) para um único bloco de memória compartilhada
+    Retorna (bloco, layout), layout = [(nome, dtype, shape, offset)] para _attach_arrays
+    """
+    layout, offset = [], 0
+    for name, array in arrays.items():
+        offset = -(-offset // 8) * 8  # alinha cada array em 8 bytes
+        layout.append((name, array.dtype.str, array.shape, offset))
+        offset += array.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for name, dtype, shape, offset in layout:
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)[...] = arrays[name]
+    return shm, layout
+
+
+def _attach_arrays(shm, layout):
+    """Arrays (só leitura) sobre o bloco compartilhado, sem cópia"""
+    arrays = {}
+    for name, dtype, shape, offset in layout:
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        array.setflags(write=False)
+        arrays[name] = array
+    return arrays
+
+
+# Estado de cada processo worker (preenchido por _init_worker)
+_worker_shm = None
+_worker_astar = None
+
+
+def _init_worker(shm_name, layout, start, end):
+    """
+    Anexa o bloco compartilhado e monta um AStar sobre ele, uma vez por worker
+    Células, tabela de adjacência e tabelas JPS+ são as do processo principal: nada é copiado
+    """
+    global _worker_shm, _worker_astar
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    # Os workers saem por os._exit (atexit não roda): o finalizador do multiprocessing roda
+    util.Finalize(None, _close_worker, exitpriority=0)
+    arrays = _attach_arrays(_worker_shm, layout)
+    cells = arrays.pop('cells')
+    jump_distances = [arrays.pop(f'jump{k}') for k in range(4)] if 'jump0' in arrays else None
+    maze = Maze._from_cells(cells, start, end)
+    maze._adjacency = GridAdjacency.from_arrays(*cells.shape, arrays, jump_distances)
+    _worker_astar = AStar(maze)
+
+
+def _close_worker():
+    """Solta as visões do bloco compartilhado e fecha o mapeamento do worker"""
+    global _worker_shm, _worker_astar
+    _worker_astar = None
+    if _worker_shm is not None:
+        _worker_shm.close()
+        _worker_shm = None
+
+
+def _run_chunk(chunk, method):
+    search = getattr(_worker_astar, method)
+    return [(index, search(start, goal)) for index, start, goal in chunk]
+
+
+def batch_search(maze, queries, workers=None, chunksize=64, method="search_array"):
+    """
+    Resolve muitas consultas (start, goal) no mesmo maze em um pool de processos
+    As células, a tabela de adjacência do maze (e as tabelas JPS+, para
+    search_jps) vão uma única vez para multiprocessing.shared_memory: os
+    workers as usam no lugar, sem pickle nem cópia por processo. Os
+    resultados são devolvidos à medida que ficam prontos, como
+    (índice_da_consulta, resultado)
+    method: "search_array" (custos do A*) ou "search_jps" (custo uniforme)
+    """
+    queries = list(queries)
+    adjacency = maze.adjacency
+    arrays = {'cells': maze.cells, **adjacency.arrays()}
+    if method == "search_jps":
+        arrays.update((f'jump{k}', np.asarray(d)) for k, d in enumerate(adjacency.jump_distances()))
+    shm, layout = _share_arrays(arrays)
+    try:
+        chunks = [[(i, start, goal) for i, (start, goal) in enumerate(queries[k:k + chunksize], k)]
+                  for k in range(0, len(queries), chunksize)]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, layout, maze.start, maze.end)) as pool:
+            futures = [pool.submit(_run_chunk, chunk, method) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def benchmark(size=300, queries=10000, seed=0):
+    """Vazão (consultas/s) do batch_search com 1 worker e com todos os núcleos"""
+    from maze import Maze
+
+    maze = Maze(size, size, obstacle_prob=0.2, seed=seed, ensure_path=True)
+    rng = random.Random(seed)
+    free = [(r, c) for r in range(size) for c in range(size) if maze.cells[r, c] != maze.CELL_WALL]
+    pairs = [(rng.choice(free), rng.choice(free)) for _ in range(queries)]
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        t0 = time.perf_counter()
+        found = sum(result[0] for _, result in batch_search(maze, pairs, workers=workers))
+        elapsed = time.perf_counter() - t0
+        print(f"{workers:>3} workers: {queries / elapsed:>8.0f} consultas/s "
+              f"({found}/{queries} com caminho)")
+
+
+if __name__ == "__main__":
+    benchmark()
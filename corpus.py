@@ -0,0 +1,81 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from aStar import AStar
+from maze import Maze
+
+
+def task_seed(seed, index):
+    """Seed da tarefa derivada só de (seed do corpus, índice): não depende de quem a executa"""
+    state = np.random.SeedSequence([seed, index]).generate_state(2, dtype=np.uint32)
+    return (int(state[0]) << 31) | (int(state[1]) >> 1)
+
+
+def _build_one(task):
+    """Gera, resolve e grava um maze; retorna os seus metadados (roda no worker)"""
+    index, size, obstacle_prob, seed, out_dir = task
+    # O aviso de ensure_connectivity é descartado: repaired/walls_removed vão nos metadados
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(size, size, obstacle_prob=obstacle_prob, seed=seed, ensure_path=True, compact=True)
+        found, path, cost, explored = AStar(maze).search()
+
+    name = f"maze_{index:05d}.maze"
+    maze.save(os.path.join(out_dir, name))
+    cells = maze.cells
+    return {
+        'index': index,
+        'file': name,
+        'seed': seed,
+        'rows': maze.rows,
+        'cols': maze.cols,
+        'obstacle_prob': obstacle_prob,
+        'obstacle_ratio': float(np.count_nonzero(cells == Maze.CELL_OBSTACLE) / cells.size),
+        'wall_ratio': float(np.count_nonzero(cells == Maze.CELL_WALL) / cells.size),
+        'repaired': maze.walls_removed > 0,
+        'walls_removed': maze.walls_removed,
+        'optimal_cost': cost if found else None,
+        'path_length': len(path),
+        'nodes_explored': explored,
+    }
+
+
+def build_corpus(out_dir, sizes=(10, 20, 50, 100), obstacle_probs=(0.1, 0.2, 0.3),
+                 per_config=10, seed=0, workers=None):
+    """
+    Gera per_config mazes para cada (tamanho, obstacle_prob) em um pool de processos
+    Cada maze vai para out_dir/maze_NNNNN.maze (formato de Maze.save) e os
+    metadados para out_dir/metadata.jsonl, na ordem das tarefas. As seeds
+    são derivadas do índice da tarefa, então a mesma seed gera arquivos
+    idênticos byte a byte com qualquer número de workers
+    Retorna a lista de metadados
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    configs = product(sizes, obstacle_probs, range(per_config))
+    tasks = [(index, size, obstacle_prob, task_seed(seed, index), out_dir)
+             for index, (size, obstacle_prob, _) in enumerate(configs)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map devolve na ordem das tarefas, independente de qual worker terminou antes
+        records = list(pool.map(_build_one, tasks, chunksize=max(1, len(tasks) // 64)))
+
+    with open(os.path.join(out_dir, "metadata.jsonl"), "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record, sort_keys=True) + "\n")
+    return records
+
+
+if __name__ == "__main__":
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else "corpus"
+    t0 = time.perf_counter()
+    records = build_corpus(out_dir)
+    repaired = sum(record['repaired'] for record in records)
+    print(f"{len(records)} mazes em {out_dir} ({time.perf_counter() - t0:.1f}s, "
+          f"{repaired} com paredes removidas)")
@@ -0,0 +1,161 @@
+import heapq
+import math
+
+
+class DStarLite:
+    """
+    Replanejamento incremental (D* Lite) em grade 4-conectada
+
+    A busca é feita do objetivo para o robô, então quando células mudam
+    (paredes descobertas, células reveladas) só a parte afetada da árvore de
+    busca é reparada, em vez de refazer o A* do zero.
+
+    costs: matriz (rows, cols) com o custo de entrar em cada célula (0 = parede)
+    start, goal: posições (row, col)
+    """
+
+    DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    def __init__(self, costs, start, goal):
+        self.rows = len(costs)
+        self.cols = len(costs[0])
+        self.costs = [int(c) for row in costs for c in row]
+        self.start = start
+        self.goal = goal
+        self.last = start
+        self.km = 0
+
+        size = self.rows * self.cols
+        self.g = [math.inf] * size
+        self.rhs = [math.inf] * size
+        self._open = {}
+        self._heap = []
+
+        # Contadores: nós expandidos no último reparo e no total
+        self.last_expansions = 0
+        self.total_expansions = 0
+        self.repairs = 0
+
+        goal_node = self._index(goal)
+        self.rhs[goal_node] = 0
+        self._push(goal_node)
+
+    def _index(self, pos):
+        return pos[0] * self.cols + pos[1]
+
+    def _neighbors(self, node):
+        row, col = divmod(node, self.cols)
+        for dr, dc in self.DIRECTIONS:
+            n_row, n_col = row + dr, col + dc
+            if 0 <= n_row < self.rows and 0 <= n_col < self.cols:
+                yield n_row * self.cols + n_col
+
+    def heuristic(self, node):
+        """Distância de Manhattan até a posição atual do robô"""
+        row, col = divmod(node, self.cols)
+        return abs(row - self.start[0]) + abs(col - self.start[1])
+
+    def _key(self, node):
+        m = min(self.g[node], self.rhs[node])
+        return (m + self.heuristic(node) + self.km, m)
+
+    def _push(self, node):
+        key = self._key(node)
+        self._open[node] = key
+        heapq.heappush(self._heap, (key, node))
+
+    def _top(self):
+        """Descarta entradas desatualizadas e retorna a menor chave válida"""
+        heap = self._heap
+        while heap:
+            key, node = heap[0]
+            if self._open.get(node) == key:
+                return key, node
+            heapq.heappop(heap)
+        return (math.inf, math.inf), None
+
+    def _update_vertex(self, node):
+        if node != self._index(self.goal):
+            best = math.inf
+            for succ in self._neighbors(node):
+                cost = self.costs[succ]
+                if cost > 0 and self.g[succ] + cost < best:
+                    best = self.g[succ] + cost
+            self.rhs[node] = best
+        if self.g[node] != self.rhs[node]:
+            self._push(node)
+        else:
+            self._open.pop(node, None)
+
+    def compute_shortest_path(self):
+        """Repara a árvore de busca até que o caminho do robô esteja consistente"""
+        start = self._index(self.start)
+        expansions = 0
+        while True:
+            top_key, node = self._top()
+            if node is None:
+                break
+            if not (top_key < self._key(start) or self.rhs[start] != self.g[start]):
+                break
+
+            new_key = self._key(node)
+            if top_key < new_key:
+                self._push(node)
+                continue
+
+            heapq.heappop(self._heap)
+            del self._open[node]
+            expansions += 1
+            if self.g[node] > self.rhs[node]:
+                self.g[node] = self.rhs[node]
+            else:
+                self.g[node] = math.inf
+                self._update_vertex(node)
+            for pred in self._neighbors(node):
+                self._update_vertex(pred)
+
+        self.last_expansions = expansions
+        self.total_expansions += expansions
+        self.repairs += 1
+        return expansions
+
+    def move_to(self, pos):
+        """Informa a nova posição do robô (ajusta km em vez de reordenar a fila)"""
+        if pos != self.start:
+            self.km += abs(pos[0] - self.last[0]) + abs(pos[1] - self.last[1])
+            self.last = pos
+            self.start = pos
+
+    def update_cell(self, row, col, cost):
+        """Notifica a mudança de custo de uma célula (0 = parede)"""
+        node = row * self.cols + col
+        if self.costs[node] == cost:
+            return
+        self.costs[node] = cost
+        # Só as arestas que entram na célula mudaram: corrige os vizinhos
+        for pred in self._neighbors(node):
+            self._update_vertex(pred)
+
+    def path(self):
+        """
+        Repara a busca e retorna o caminho [(row, col), ...] do robô até o
+        objetivo, ou None se não houver caminho
+        """
+        self.compute_shortest_path()
+        node = self._index(self.start)
+        goal = self._index(self.goal)
+        if self.g[node] == math.inf:
+            return None
+
+        path = [self.start]
+        while node != goal and len(path) <= len(self.costs):
+            best, best_cost = None, math.inf
+            for succ in self._neighbors(node):
+                cost = self.costs[succ]
+                if cost > 0 and self.g[succ] + cost < best_cost:
+                    best, best_cost = succ, self.g[succ] + cost
+            if best is None:
+                return None
+            node = best
+            path.append(divmod(node, self.cols))
+        return path if node == goal else None
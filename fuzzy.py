@@ -1,96 +1,132 @@
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
 import numpy as np
 
-# 1. Criação das variáveis fuzzy
-front = ctrl.Antecedent(np.arange(0, 201, 1), 'front')
-right = ctrl.Antecedent(np.arange(0, 201, 1), 'right')
-left  = ctrl.Antecedent(np.arange(0, 201, 1), 'left')
-diag_right = ctrl.Antecedent(np.arange(0, 201, 1), 'diag_right')
-diag_left  = ctrl.Antecedent(np.arange(0, 201, 1), 'diag_left')
+from fuzzy_engine import MamdaniEngine, SugenoEngine
 
-speed    = ctrl.Consequent(np.arange(0, 6, 1), 'speed')
+# O sistema de controle é montado no primeiro uso (fuzzy.steering_sim, fuzzy.front...):
+# importar este módulo não carrega o skfuzzy nem compila as regras
+_LAZY_NAMES = ('front', 'right', 'left', 'diag_right', 'diag_left', 'speed',
+               'steering', 'rules', 'steering_ctrl', 'steering_sim', 'steering_engine')
 
-# 2. Funções de pertinência
-for s in [front, right, left, diag_right, diag_left]:
-    s['near']   = fuzz.trimf(s.universe, [0, 0, 50])
-    s['medium'] = fuzz.trimf(s.universe, [30, 90, 150])
-    s['far']    = fuzz.trimf(s.universe, [120, 200, 200])
+# Ordem das colunas de steering_engine (a mesma de sensor_angles em game.py)
+SENSORS = ('front', 'right', 'left', 'diag_right', 'diag_left')
 
-steering = ctrl.Consequent(np.arange(-15, 16, 1), 'steering')
 
-steering['right_strong']  = fuzz.trimf(steering.universe, [-10, -10, -5])
-steering['right_slight']  = fuzz.trimf(steering.universe, [-10, -5, 0])
-steering['straight']      = fuzz.trimf(steering.universe, [-1, 0, 1])
-steering['left_slight']   = fuzz.trimf(steering.universe, [0, 5, 10])
-steering['left_strong']   = fuzz.trimf(steering.universe, [5, 10, 10])
+def _build():
+    """Cria variáveis, regras e a simulação de direção e as publica no módulo"""
+    import skfuzzy as fuzz
+    from skfuzzy import control as ctrl
 
-speed['slow'] = fuzz.trimf(speed.universe, [0, 0, 2])
-speed['medium'] = fuzz.trimf(speed.universe, [1, 3, 5])
-speed['fast'] = fuzz.trimf(speed.universe, [3, 5, 5])
+    # 1. Criação das variáveis fuzzy
+    front = ctrl.Antecedent(np.arange(0, 201, 1), 'front')
+    right = ctrl.Antecedent(np.arange(0, 201, 1), 'right')
+    left  = ctrl.Antecedent(np.arange(0, 201, 1), 'left')
+    diag_right = ctrl.Antecedent(np.arange(0, 201, 1), 'diag_right')
+    diag_left  = ctrl.Antecedent(np.arange(0, 201, 1), 'diag_left')
 
-# # 3. Regras fuzzy
-# rules = []
+    speed    = ctrl.Consequent(np.arange(0, 6, 1), 'speed')
 
-# # Evita bater na parede frontal
-# rules.append(ctrl.Rule(front['medium'], steering['left_strong']))
-# rules.append(ctrl.Rule(front['far'] , steering['straight']))
+    # 2. Funções de pertinência
+    for s in [front, right, left, diag_right, diag_left]:
+        s['near']   = fuzz.trimf(s.universe, [0, 0, 50])
+        s['medium'] = fuzz.trimf(s.universe, [30, 90, 150])
+        s['far']    = fuzz.trimf(s.universe, [120, 200, 200])
 
-# # Mantém parede direita
-# rules.append(ctrl.Rule(right['near'], steering['left_slight']))
+    steering = ctrl.Consequent(np.arange(-15, 16, 1), 'steering')
 
-# # Ajuste com diagonais
-# rules.append(ctrl.Rule(diag_right['near'] , steering['left_strong']))
-# rules.append(ctrl.Rule(diag_left['near'], steering['right_strong']))
-# rules.append(ctrl.Rule(diag_right['medium'] , steering['left_slight']))
-# rules.append(ctrl.Rule(diag_left['medium'], steering['right_slight']))
+    steering['right_strong']  = fuzz.trimf(steering.universe, [-10, -10, -5])
+    steering['right_slight']  = fuzz.trimf(steering.universe, [-10, -5, 0])
+    steering['straight']      = fuzz.trimf(steering.universe, [-1, 0, 1])
+    steering['left_slight']   = fuzz.trimf(steering.universe, [0, 5, 10])
+    steering['left_strong']   = fuzz.trimf(steering.universe, [5, 10, 10])
 
-# rules.append(ctrl.Rule(left['medium'], steering['right_slight']))
+    speed['slow'] = fuzz.trimf(speed.universe, [0, 0, 2])
+    speed['medium'] = fuzz.trimf(speed.universe, [1, 3, 5])
+    speed['fast'] = fuzz.trimf(speed.universe, [3, 5, 5])
 
-# 3. Regras fuzzy QUASE FUNCIONA
-# rules = []
+    # # 3. Regras fuzzy
+    # rules = []
 
-# rules.append(ctrl.Rule(front['near'] & diag_right['near'] & diag_left['far'], steering['left_strong']))
-# rules.append(ctrl.Rule(front['near'] & diag_left['near'] & diag_right['far'], steering['right_strong']))
+    # # Evita bater na parede frontal
+    # rules.append(ctrl.Rule(front['medium'], steering['left_strong']))
+    # rules.append(ctrl.Rule(front['far'] , steering['straight']))
 
-# rules.append(ctrl.Rule(front['medium'] & diag_right['medium'] & diag_left['far'], steering['left_slight']))
-# rules.append(ctrl.Rule(front['medium'] & diag_left['medium'] & diag_right['far'], steering['right_slight']))
+    # # Mantém parede direita
+    # rules.append(ctrl.Rule(right['near'], steering['left_slight']))
 
-# rules.append(ctrl.Rule(front['far'] & right['far'] & left['far'], steering['straight']))
-# rules.append(ctrl.Rule(~front['far'] & right['far'] & left['far'], steering['left_strong']))
+    # # Ajuste com diagonais
+    # rules.append(ctrl.Rule(diag_right['near'] , steering['left_strong']))
+    # rules.append(ctrl.Rule(diag_left['near'], steering['right_strong']))
+    # rules.append(ctrl.Rule(diag_right['medium'] , steering['left_slight']))
+    # rules.append(ctrl.Rule(diag_left['medium'], steering['right_slight']))
 
-# rules.append(ctrl.Rule(front['far'] & diag_right['near'] & diag_left['far'], steering['left_strong']))
-# rules.append(ctrl.Rule(front['far'] & diag_right['medium'] & diag_left['far'], steering['left_slight']))
-# rules.append(ctrl.Rule(front['far'] & diag_right['far'] & diag_left['near'], steering['right_strong']))
-# rules.append(ctrl.Rule(front['far'] & diag_right['far'] & diag_left['medium'], steering['right_slight']))
+    # rules.append(ctrl.Rule(left['medium'], steering['right_slight']))
 
-# rules.append(ctrl.Rule(~front['far'] & diag_left['far'] & diag_right['far'], steering['left_strong']))
+    # 3. Regras fuzzy QUASE FUNCIONA
+    # rules = []
 
-# rules.append(ctrl.Rule(front['near'] & diag_left['near'] & diag_right['near'], steering['left_strong']))
+    # rules.append(ctrl.Rule(front['near'] & diag_right['near'] & diag_left['far'], steering['left_strong']))
+    # rules.append(ctrl.Rule(front['near'] & diag_left['near'] & diag_right['far'], steering['right_strong']))
 
-# rules.append(ctrl.Rule(right['near'] & ~diag_right['far'] & diag_left['far'], steering['left_slight']))
+    # rules.append(ctrl.Rule(front['medium'] & diag_right['medium'] & diag_left['far'], steering['left_slight']))
+    # rules.append(ctrl.Rule(front['medium'] & diag_left['medium'] & diag_right['far'], steering['right_slight']))
 
-# rules.append(ctrl.Rule(~front['far'] & ~diag_right['far'] & diag_left['far'], steering['left_slight']))
+    # rules.append(ctrl.Rule(front['far'] & right['far'] & left['far'], steering['straight']))
+    # rules.append(ctrl.Rule(~front['far'] & right['far'] & left['far'], steering['left_strong']))
 
-rules = []
+    # rules.append(ctrl.Rule(front['far'] & diag_right['near'] & diag_left['far'], steering['left_strong']))
+    # rules.append(ctrl.Rule(front['far'] & diag_right['medium'] & diag_left['far'], steering['left_slight']))
+    # rules.append(ctrl.Rule(front['far'] & diag_right['far'] & diag_left['near'], steering['right_strong']))
+    # rules.append(ctrl.Rule(front['far'] & diag_right['far'] & diag_left['medium'], steering['right_slight']))
 
-rules.append(ctrl.Rule(~front['far'] & ~diag_left['far'] & diag_right['far'], steering['right_strong']))
-rules.append(ctrl.Rule(~front['far'] & ~diag_right['far'] & diag_left['far'], steering['left_strong']))
-rules.append(ctrl.Rule(~front['far'] & diag_right['far'] & diag_left['far'], steering['left_slight']))
-rules.append(ctrl.Rule(~front['far'] & diag_right['medium'] & diag_left['medium'], steering['right_slight']))
-rules.append(ctrl.Rule(~front['far'] & diag_right['near'] & diag_left['near'], steering['left_strong']))
-rules.append(ctrl.Rule(front['far'] & right['near'] & left['far'], steering['left_slight']))
-rules.append(ctrl.Rule(front['far'] & right['far'] & left['near'], steering['right_slight']))
-rules.append(ctrl.Rule(front['far'] & ~right['far'] & left['far'], steering['right_slight']))
-rules.append(ctrl.Rule(front['far'] & right['far'] & ~left['far'], steering['left_slight']))
+    # rules.append(ctrl.Rule(~front['far'] & diag_left['far'] & diag_right['far'], steering['left_strong']))
+
+    # rules.append(ctrl.Rule(front['near'] & diag_left['near'] & diag_right['near'], steering['left_strong']))
+
+    # rules.append(ctrl.Rule(right['near'] & ~diag_right['far'] & diag_left['far'], steering['left_slight']))
+
+    # rules.append(ctrl.Rule(~front['far'] & ~diag_right['far'] & diag_left['far'], steering['left_slight']))
+
+    rules = []
+
+    rules.append(ctrl.Rule(~front['far'] & ~diag_left['far'] & diag_right['far'], steering['right_strong']))
+    rules.append(ctrl.Rule(~front['far'] & ~diag_right['far'] & diag_left['far'], steering['left_strong']))
+    rules.append(ctrl.Rule(~front['far'] & diag_right['far'] & diag_left['far'], steering['left_slight']))
+    rules.append(ctrl.Rule(~front['far'] & diag_right['medium'] & diag_left['medium'], steering['right_slight']))
+    rules.append(ctrl.Rule(~front['far'] & diag_right['near'] & diag_left['near'], steering['left_strong']))
+    rules.append(ctrl.Rule(front['far'] & right['near'] & left['far'], steering['left_slight']))
+    rules.append(ctrl.Rule(front['far'] & right['far'] & left['near'], steering['right_slight']))
+    rules.append(ctrl.Rule(front['far'] & ~right['far'] & left['far'], steering['right_slight']))
+    rules.append(ctrl.Rule(front['far'] & right['far'] & ~left['far'], steering['left_slight']))
+
+    # 4. Sistema de controle
+    steering_ctrl = ctrl.ControlSystem(rules)
+    steering_sim = ctrl.ControlSystemSimulation(steering_ctrl)
+    # Mesmas regras compiladas para NumPy: steering_engine.compute(matriz (N, 5)) → N ângulos
+    steering_engine = MamdaniEngine(rules, [front, right, left, diag_right, diag_left], steering)
+
+    namespace = locals()
+    globals().update({name: namespace[name] for name in _LAZY_NAMES})
+
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        _build()
+        return globals()[name]
+    if name == 'steering_sugeno':
+        # Aproximação Sugeno (TSK) de ordem zero do steering_engine: o ajuste
+        # (~1s) só roda quando alguém pede o controlador
+        globals()['steering_sugeno'] = SugenoEngine.fit(__getattr__('steering_engine'))
+        return globals()['steering_sugeno']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# 4. Sistema de controle
-steering_ctrl = ctrl.ControlSystem(rules)
-steering_sim = ctrl.ControlSystemSimulation(steering_ctrl)
 
 # Para usar:
 # steering_sim.input['front'] = dist_front
 # steering_sim.input['right'] = dist_right
 # ...
 # steering_sim.compute()
-# steer_angle = steering_sim.output['steering']
\ No newline at end of file
+# steer_angle = steering_sim.output['steering']
+# Ou em lote (uma linha por robô, colunas na ordem de SENSORS):
+# steer_angles = steering_engine.compute(distances)
+# Ou com a aproximação Sugeno (mais barata; erro medido em fuzzy_engine.benchmark):
+# steer_angle = steering_sugeno.compute_one(distances)
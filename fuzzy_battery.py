@@ -1,44 +1,83 @@
+import os
+import time
+
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
 
-battery = ctrl.Antecedent(np.arange(0, 101, 1), 'battery')
-charger_distance = ctrl.Antecedent(np.arange(0, 21, 1), 'charger_distance')
-goal_distance = ctrl.Antecedent(np.arange(0, 21, 1), 'goal_distance')
-priority = ctrl.Consequent(np.arange(0, 101, 1), 'priority')
+from fuzzy_sampling import sample_system, system_hash
+
+# Sistema montado no primeiro uso: importar o módulo não carrega o skfuzzy
+_LAZY_NAMES = ('battery', 'charger_distance', 'goal_distance', 'priority', 'rules', 'priority_ctrl')
+
+
+def _build():
+    """Cria variáveis, regras e o sistema de prioridade (uma única vez)"""
+    if 'priority_ctrl' in globals():
+        return
+    import skfuzzy as fuzz
+    from skfuzzy import control as ctrl
+
+    battery = ctrl.Antecedent(np.arange(0, 101, 1), 'battery')
+    charger_distance = ctrl.Antecedent(np.arange(0, 21, 1), 'charger_distance')
+    goal_distance = ctrl.Antecedent(np.arange(0, 21, 1), 'goal_distance')
+    priority = ctrl.Consequent(np.arange(0, 101, 1), 'priority')
+
+    battery['low'] = fuzz.trapmf(battery.universe, [0, 0, 20, 40])
+    battery['medium'] = fuzz.trimf(battery.universe, [20, 50, 80])
+    battery['high'] = fuzz.trapmf(battery.universe, [60, 80, 100, 100])
+
+    charger_distance['near'] = fuzz.trapmf(charger_distance.universe, [0, 0, 3, 6])
+    charger_distance['medium'] = fuzz.trimf(charger_distance.universe, [3, 8, 13])
+    charger_distance['far'] = fuzz.trapmf(charger_distance.universe, [10, 15, 20, 20])
+
+    goal_distance['near'] = fuzz.trapmf(goal_distance.universe, [0, 0, 3, 6])
+    goal_distance['medium'] = fuzz.trimf(goal_distance.universe, [3, 8, 13])
+    goal_distance['far'] = fuzz.trapmf(goal_distance.universe, [10, 15, 20, 20])
+
+    priority['recharge'] = fuzz.trapmf(priority.universe, [0, 0, 30, 60])
+    priority['end'] = fuzz.trapmf(priority.universe, [40, 70, 100, 100])
+
+    rules = [
+        ctrl.Rule(battery['low'] & charger_distance['near'], priority['recharge']),
+
+        ctrl.Rule(battery['low'] & charger_distance['far'], priority['recharge']),
 
-battery['low'] = fuzz.trapmf(battery.universe, [0, 0, 20, 40])
-battery['medium'] = fuzz.trimf(battery.universe, [20, 50, 80])
-battery['high'] = fuzz.trapmf(battery.universe, [60, 80, 100, 100])
+        ctrl.Rule(battery['medium'] & goal_distance['near'], priority['end']),
 
-charger_distance['near'] = fuzz.trapmf(charger_distance.universe, [0, 0, 3, 6])
-charger_distance['medium'] = fuzz.trimf(charger_distance.universe, [3, 8, 13])
-charger_distance['far'] = fuzz.trapmf(charger_distance.universe, [10, 15, 20, 20])
+        ctrl.Rule(battery['medium'] & goal_distance['far'] & charger_distance['near'], priority['recharge']),
 
-goal_distance['near'] = fuzz.trapmf(goal_distance.universe, [0, 0, 3, 6])
-goal_distance['medium'] = fuzz.trimf(goal_distance.universe, [3, 8, 13])
-goal_distance['far'] = fuzz.trapmf(goal_distance.universe, [10, 15, 20, 20])
+        ctrl.Rule(battery['medium'] & charger_distance['far'] & goal_distance['near'], priority['end']),
 
-priority['recharge'] = fuzz.trapmf(priority.universe, [0, 0, 30, 60])
-priority['end'] = fuzz.trapmf(priority.universe, [40, 70, 100, 100])
+        ctrl.Rule(battery['high'], priority['end'])
+    ]
 
-rules = [
-    ctrl.Rule(battery['low'] & charger_distance['near'], priority['recharge']),
-    
-    ctrl.Rule(battery['low'] & charger_distance['far'], priority['recharge']),
+    priority_ctrl = ctrl.ControlSystem(rules)
 
-    ctrl.Rule(battery['medium'] & goal_distance['near'], priority['end']),
+    namespace = locals()
+    globals().update({name: namespace[name] for name in _LAZY_NAMES})
 
-    ctrl.Rule(battery['medium'] & goal_distance['far'] & charger_distance['near'], priority['recharge']),
 
-    ctrl.Rule(battery['medium'] & charger_distance['far'] & goal_distance['near'], priority['end']),
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        _build()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    ctrl.Rule(battery['high'], priority['end'])
-]
 
-priority_ctrl = ctrl.ControlSystem(rules)
+# Decisão quando nenhuma regra dispara (o skfuzzy lança exceção)
+FALLBACK = "recharge"
 
-def decide_goal(battery_level, distance_to_charger, distance_to_goal):
+
+def decide_goal(battery_level, distance_to_charger, distance_to_goal, compiled=False):
+    """
+    "recharge" ou "end" para o estado atual
+    compiled=True responde pela tabela pré-calculada (PriorityTable), sem
+    skfuzzy; ela só é exata com entradas inteiras (ver PriorityTable)
+    """
+    if compiled:
+        table = _compiled if _compiled is not None else compiled_table()
+        return table.decide(battery_level, distance_to_charger, distance_to_goal)
+    _build()
+    from skfuzzy import control as ctrl
     sim = ctrl.ControlSystemSimulation(priority_ctrl)
     sim.input['battery'] = battery_level
     sim.input['charger_distance'] = distance_to_charger
@@ -48,6 +87,236 @@ def decide_goal(battery_level, distance_to_charger, distance_to_goal):
         sim.compute()
         value = sim.output['priority']
     except Exception:
-        return "recharge"
+        return FALLBACK
 
     return "recharge" if value < 50 else "end"
+
+
+# Modo compilado: as entradas vivem em universos inteiros pequenos, então a
+# superfície de decisão inteira cabe numa tabela 101 x 21 x 21
+TABLE_INPUTS = ('battery', 'charger_distance', 'goal_distance')
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+_SAMPLE_CHUNK = 4096
+_compiled = None
+
+
+def rules_hash():
+    """Hash do sistema (universos, funções de pertinência, regras e defuzzificação)"""
+    _build()
+    return system_hash([battery, charger_distance, goal_distance, priority], rules)
+
+
+def sample_priority(battery_levels, charger_distances, goal_distances):
+    """
+    Saída 'priority' do skfuzzy para muitos pontos de uma vez (simulação vetorizada)
+    Pontos em que nenhuma regra dispara (o skfuzzy lança exceção) viram NaN
+    """
+    _build()
+    inputs = dict(zip(TABLE_INPUTS, (battery_levels, charger_distances, goal_distances)))
+    return sample_system(priority_ctrl, rules, inputs, 'priority', chunk=_SAMPLE_CHUNK)
+
+
+def _is_scalar(a, b, c):
+    scalar = (int, float, np.number)
+    return isinstance(a, scalar) and isinstance(b, scalar) and isinstance(c, scalar)
+
+
+class PriorityTable:
+    """
+    Superfície de prioridade do priority_ctrl amostrada nos pontos inteiros
+    values[bateria, dist_carregador, dist_objetivo]; NaN onde o skfuzzy não
+    tem saída (decide_goal responde FALLBACK nesses casos)
+
+    Exata só nos pontos inteiros: entre eles a superfície do skfuzzy não é
+    linear e nem o ponto mais próximo nem a interpolação garantem a mesma
+    decisão (verify_table mede o erro fora da grade). Quem usa a tabela
+    arredonda as entradas, como gameNew.
+    """
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.shape = self.values.shape
+        # Lista plana: consultas escalares sem overhead de NumPy
+        self._flat = self.values.ravel().tolist()
+        self._strides = (self.shape[1] * self.shape[2], self.shape[2])
+
+    @classmethod
+    def compile(cls, cache_dir=CACHE_DIR):
+        """
+        Amostra o sistema uma vez em todos os pontos inteiros
+        Com cache_dir, a tabela fica em disco com o hash das regras no nome:
+        mudou uma regra ou função de pertinência, a tabela é refeita
+        """
+        _build()
+        path = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, f"priority_{rules_hash()[:16]}.npy")
+            if os.path.exists(path):
+                return cls(np.load(path))
+
+        shape = tuple(len(variable.universe) for variable in (battery, charger_distance, goal_distance))
+        grid = np.meshgrid(battery.universe, charger_distance.universe, goal_distance.universe, indexing='ij')
+        values = sample_priority(*grid).reshape(shape)
+
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, 'wb') as file:
+                np.save(file, values)
+            os.replace(temp, path)
+        return cls(values)
+
+    def _scalar(self, b, c, g, interpolate):
+        hi_b, hi_c, hi_g = self.shape[0] - 1, self.shape[1] - 1, self.shape[2] - 1
+        b = min(max(b, 0), hi_b)
+        c = min(max(c, 0), hi_c)
+        g = min(max(g, 0), hi_g)
+        stride_b, stride_c = self._strides
+        flat = self._flat
+        if not interpolate:
+            return flat[int(b + 0.5) * stride_b + int(c + 0.5) * stride_c + int(g + 0.5)]
+
+        b0, c0, g0 = int(b), int(c), int(g)
+        fb, fc, fg = b - b0, c - c0, g - g0
+        base = b0 * stride_b + c0 * stride_c + g0
+        # Trilinear como interpolações lineares encadeadas; fração zero não lê o
+        # vizinho (um NaN com peso zero não deve contaminar o resultado)
+        value = self._bilinear(base, fc, fg)
+        if fb:
+            value += fb * (self._bilinear(base + stride_b, fc, fg) - value)
+        return value
+
+    def _bilinear(self, base, fc, fg):
+        flat = self._flat
+        value = flat[base]
+        if fg:
+            value += fg * (flat[base + 1] - value)
+        if fc:
+            upper = flat[base + self._strides[1]]
+            if fg:
+                upper += fg * (flat[base + self._strides[1] + 1] - upper)
+            value += fc * (upper - value)
+        return value
+
+    def priority(self, battery_level, distance_to_charger, distance_to_goal, interpolate=False):
+        """
+        Prioridade para um ponto ou para arrays (vetorizado, com broadcasting)
+        Entradas fora do universo são limitadas às bordas (como no skfuzzy);
+        padrão: ponto inteiro mais próximo; interpolate=True usa interpolação
+        trilinear (a superfície do skfuzzy não é linear entre os pontos, então
+        isso não reduz o erro de decisão neste sistema)
+        """
+        if _is_scalar(battery_level, distance_to_charger, distance_to_goal):
+            return self._scalar(float(battery_level), float(distance_to_charger),
+                                float(distance_to_goal), interpolate)
+
+        points = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64)
+                                       for v in (battery_level, distance_to_charger, distance_to_goal)))
+        points = [np.clip(p, 0, size - 1) for p, size in zip(points, self.shape)]
+        if not interpolate:
+            return self.values[tuple(np.floor(p + 0.5).astype(np.intp) for p in points)]
+
+        lows = [np.minimum(p.astype(np.intp), size - 2) for p, size in zip(points, self.shape)]
+        fracs = [p - low for p, low in zip(points, lows)]
+        value = np.zeros(points[0].shape)
+        for corner in range(8):
+            index, weight = [], 1.0
+            for axis in range(3):
+                up = (corner >> axis) & 1
+                index.append(lows[axis] + up)
+                weight = weight * (fracs[axis] if up else 1 - fracs[axis])
+            # Peso zero não propaga NaN do vizinho
+            value = value + np.where(weight > 0, weight * self.values[tuple(index)], 0.0)
+        return value
+
+    def decide(self, battery_level, distance_to_charger, distance_to_goal, interpolate=False):
+        """
+        Mesma regra de decide_goal: prioridade < 50 → "recharge"
+        Sem saída na tabela: FALLBACK num ponto inteiro (é o que o skfuzzy faz
+        ali); fora da grade o vizinho sem saída não diz nada sobre o ponto, que
+        é decidido por decide_goal
+        """
+        if _is_scalar(battery_level, distance_to_charger, distance_to_goal):
+            point = (float(battery_level), float(distance_to_charger), float(distance_to_goal))
+            value = self._scalar(*point, interpolate)
+            if value != value:
+                return FALLBACK if all(v.is_integer() for v in point) else decide_goal(*point)
+            return "end" if value >= 50 else "recharge"
+
+        points = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64)
+                                       for v in (battery_level, distance_to_charger, distance_to_goal)))
+        value = self.priority(*points, interpolate=interpolate)
+        decision = np.where(value >= 50, "end", "recharge")
+        off_grid = np.isnan(value) & np.any([p != np.floor(p) for p in points], axis=0)
+        decision[np.isnan(value)] = FALLBACK
+        for index in zip(*np.nonzero(off_grid)):
+            decision[index] = decide_goal(*(float(p[index]) for p in points))
+        return decision
+
+
+def compiled_table():
+    """Tabela compilada do processo (carregada do cache em disco ou amostrada no primeiro uso)"""
+    global _compiled
+    if _compiled is None:
+        _compiled = PriorityTable.compile()
+    return _compiled
+
+
+def verify_table(table=None, samples=2000, seed=0, interpolate=False, integer=False):
+    """
+    Compara a tabela com o skfuzzy em pontos aleatórios dos universos
+    integer=True sorteia pontos inteiros (onde a tabela tem que ser exata);
+    False, pontos reais (erro da tabela fora da grade)
+    Retorna erro máximo da prioridade (onde ambos têm saída), pontos em que
+    só um tem saída e decisões diferentes
+    """
+    table = compiled_table() if table is None else table
+    rng = np.random.default_rng(seed)
+    if integer:
+        points = [rng.integers(0, size, samples).astype(np.float64) for size in table.shape]
+    else:
+        points = [rng.uniform(0, size - 1, samples) for size in table.shape]
+    expected = sample_priority(*points)
+    actual = table.priority(*points, interpolate=interpolate)
+    both = ~np.isnan(expected) & ~np.isnan(actual)
+    decisions = np.where(expected >= 50, "end", "recharge") != table.decide(*points, interpolate=interpolate)
+    return {
+        'samples': samples,
+        'max_error': float(np.abs(expected[both] - actual[both]).max()) if both.any() else 0.0,
+        'nan_mismatches': int(np.count_nonzero(np.isnan(expected) != np.isnan(actual))),
+        'decision_mismatches': int(np.count_nonzero(decisions)),
+    }
+
+
+def benchmark(calls=200):
+    """Latência por chamada: skfuzzy x tabela (escalar e em lote)"""
+    t0 = time.perf_counter()
+    table = compiled_table()
+    print(f"tabela {table.shape}: {time.perf_counter() - t0:.2f}s (compilação ou cache)")
+    print(f"pontos inteiros: {verify_table(table, integer=True)}")
+    for interpolate in (False, True):
+        exact = verify_table(table, interpolate=interpolate)
+        print(f"pontos reais, interpolate={interpolate}: {exact}")
+
+    rng = np.random.default_rng(0)
+    states = [(float(b), float(c), float(g)) for b, c, g in
+              zip(rng.uniform(0, 100, calls), rng.uniform(0, 20, calls), rng.uniform(0, 20, calls))]
+    t0 = time.perf_counter()
+    for state in states:
+        decide_goal(*state)
+    slow = (time.perf_counter() - t0) / calls
+    t0 = time.perf_counter()
+    for _ in range(100):
+        for state in states:
+            decide_goal(*state, compiled=True)
+    fast = (time.perf_counter() - t0) / (100 * calls)
+    batch = np.array(states * 500).T
+    t0 = time.perf_counter()
+    table.decide(*batch)
+    vectorized = (time.perf_counter() - t0) / batch.shape[1]
+    print(f"skfuzzy: {slow * 1e6:.0f}µs/chamada | tabela: {fast * 1e6:.2f}µs/chamada "
+          f"({slow / fast:.0f}x) | lote: {vectorized * 1e9:.0f}ns/ponto")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,145 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+
+class MemoCache:
+    """
+    Memoização LRU limitada na frente de um controlador fuzzy
+
+    As entradas são quantizadas (múltiplo mais próximo de quantum, um valor
+    para todas as entradas ou um por entrada) e a função é sempre avaliada
+    no ponto quantizado: o resultado guardado não depende de qual entrada
+    chegou primeiro ao mesmo balde.
+
+    Contadores: hits, misses, evictions (e warmed para o pré-aquecimento).
+    Com record=True as chaves consultadas são gravadas, para salvar um
+    trace de uma sessão longa e pré-aquecer o cache na próxima (warm).
+    """
+
+    def __init__(self, func, maxsize=4096, quantum=1, record=False):
+        self.func = func
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self.record = record
+        self.trace = []
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.warmed = 0
+
+    def key(self, inputs):
+        """Chave inteira (índice do balde) de cada entrada"""
+        quantum = self.quantum
+        if isinstance(quantum, (int, float)):
+            return tuple(math.floor(v / quantum + 0.5) for v in inputs)
+        return tuple(math.floor(v / q + 0.5) for v, q in zip(inputs, quantum))
+
+    def _point(self, key):
+        """Ponto quantizado (representante do balde) em que a função é avaliada"""
+        quantum = self.quantum
+        if isinstance(quantum, (int, float)):
+            return tuple(k * quantum for k in key)
+        return tuple(k * q for k, q in zip(key, quantum))
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __call__(self, *inputs):
+        key = self.key(inputs)
+        if self.record:
+            self.trace.append(key)
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        value = self.func(*self._point(key))
+        self._store(key, value)
+        return value
+
+    def warm(self, trace):
+        """
+        Pré-aquece com entradas gravadas (trace de chaves de save_trace/load_trace)
+        Não mexe em hits/misses: só conta as avaliações em warmed
+        """
+        for key in trace:
+            key = tuple(int(k) for k in key)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                continue
+            self._store(key, self.func(*self._point(key)))
+            self.warmed += 1
+
+    def save_trace(self, path):
+        """Grava as chaves consultadas (record=True) como matriz int32 .npy"""
+        np.save(path, np.array(self.trace, dtype=np.int32).reshape(len(self.trace), -1))
+
+    @staticmethod
+    def load_trace(path):
+        return np.load(path)
+
+    def stats(self):
+        calls = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'warmed': self.warmed,
+            'hit_rate': self.hits / calls if calls else 0.0,
+        }
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        self._entries.clear()
+        self.trace = []
+        self.hits = self.misses = self.evictions = self.warmed = 0
+
+
+def steering_cache(maxsize=4096, quantum=1, record=False, controller='mamdani'):
+    """
+    Cache de direção: chamada com as 5 distâncias (ordem de fuzzy.SENSORS)
+    controller: 'mamdani' (fuzzy.steering_engine), 'sugeno' (fuzzy.steering_sugeno)
+    ou 'skfuzzy' (fuzzy.steering_sim)
+    Saída sem regra disparada vira NaN em todos os casos
+    """
+    import fuzzy
+
+    if controller == 'mamdani':
+        def steer(*distances):
+            return float(fuzzy.steering_engine.compute([distances])[0])
+    elif controller == 'sugeno':
+        def steer(*distances):
+            return fuzzy.steering_sugeno.compute_one(distances)
+    elif controller == 'skfuzzy':
+        def steer(*distances):
+            sim = fuzzy.steering_sim
+            for label, distance in zip(fuzzy.SENSORS, distances):
+                sim.input[label] = distance
+            try:
+                sim.compute()
+                return float(sim.output['steering'])
+            except Exception:
+                return math.nan
+    else:
+        raise ValueError(f"controlador desconhecido: {controller!r}")
+
+    return MemoCache(steer, maxsize=maxsize, quantum=quantum, record=record)
+
+
+def decision_cache(maxsize=4096, quantum=1, record=False, compiled=False):
+    """Cache de fuzzy_battery.decide_goal(bateria, dist_carregador, dist_objetivo)"""
+    from fuzzy_battery import decide_goal
+
+    def decide(battery_level, distance_to_charger, distance_to_goal):
+        return decide_goal(battery_level, distance_to_charger, distance_to_goal, compiled=compiled)
+
+    return MemoCache(decide, maxsize=maxsize, quantum=quantum, record=record)
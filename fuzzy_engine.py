@@ -0,0 +1,270 @@
+from bisect import bisect_right
+
+import numpy as np
+
+
+class MamdaniEngine:
+    """
+    Inferência Mamdani em lote com NumPy, compilada a partir de regras do skfuzzy
+
+    As regras viram árvores de tuplas (termo / and / or / not) sobre as
+    pertinências das entradas; a avaliação é só fmin/fmax/1-x em arrays (N,).
+    A saída segue o skfuzzy passo a passo: ativação = disparo * peso,
+    acumulação por termo com o método da variável (fmax), corte de cada termo
+    na sua ativação, união (max) e centroide exato da função linear por partes
+    no universo da saída acrescido dos pontos onde cada termo cruza o corte.
+
+    inputs: antecedentes na ordem das colunas da matriz de entrada
+    output: consequente a defuzzificar
+    """
+
+    def __init__(self, rules, inputs, output):
+        self.input_labels = [variable.label for variable in inputs]
+        self._columns = {label: col for col, label in enumerate(self.input_labels)}
+        self._universes = [np.asarray(variable.universe, dtype=np.float64) for variable in inputs]
+        self._input_mfs = {}  # (coluna, rótulo do termo) -> pertinência no universo
+
+        self.output_label = output.label
+        self.universe = np.asarray(output.universe, dtype=np.float64)
+        self._accumulate = output.accumulation_method
+        self._term_index = {}
+        self.term_mfs = []
+
+        self.rules = []
+        for rule in rules:
+            tree = self._compile(rule.antecedent, rule.and_func, rule.or_func)
+            consequents = []
+            for weighted in rule.consequent:
+                term = weighted.term
+                if term.parent is not output:
+                    continue
+                if term.label not in self._term_index:
+                    self._term_index[term.label] = len(self.term_mfs)
+                    self.term_mfs.append(np.asarray(term.mf, dtype=np.float64))
+                consequents.append((self._term_index[term.label], weighted.weight))
+            self.rules.append((tree, consequents))
+        # Só os termos usados em alguma regra entram na saída (como no skfuzzy)
+        self.term_mfs = np.array(self.term_mfs)
+
+    def _compile(self, antecedent, and_func, or_func):
+        """Árvore do skfuzzy → tuplas ('term', chave) / ('not', a) / (função, a, b)"""
+        from skfuzzy.control.term import Term
+        if isinstance(antecedent, Term):
+            variable = antecedent.parent
+            key = (self._columns[variable.label], antecedent.label)
+            self._input_mfs[key] = np.asarray(antecedent.mf, dtype=np.float64)
+            return ('term', key)
+        first = self._compile(antecedent.term1, and_func, or_func)
+        if antecedent.kind == 'not':
+            return ('not', first)
+        second = self._compile(antecedent.term2, and_func, or_func)
+        return (and_func if antecedent.kind == 'and' else or_func, first, second)
+
+    def _evaluate(self, node, memberships):
+        if node[0] == 'term':
+            return memberships[node[1]]
+        if node[0] == 'not':
+            return 1.0 - self._evaluate(node[1], memberships)
+        return node[0](self._evaluate(node[1], memberships), self._evaluate(node[2], memberships))
+
+    def firing(self, x):
+        """Grau de disparo de cada regra: matriz (N, regras)"""
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        memberships = {}
+        for (col, label), mf in self._input_mfs.items():
+            universe = self._universes[col]
+            # Entradas fora do universo são limitadas às bordas (clip_to_bounds do skfuzzy)
+            memberships[(col, label)] = np.interp(np.clip(x[:, col], universe[0], universe[-1]), universe, mf)
+        return np.stack([self._evaluate(tree, memberships) for tree, _ in self.rules], axis=1)
+
+    def activations(self, x):
+        """Corte (ativação acumulada) de cada termo da saída: matriz (N, termos)"""
+        firing = self.firing(x)
+        cuts = np.full((len(firing), len(self.term_mfs)), np.nan)
+        for rule, (_, consequents) in enumerate(self.rules):
+            for term, weight in consequents:
+                activation = firing[:, rule] * weight
+                current = cuts[:, term]
+                cuts[:, term] = np.where(np.isnan(current), activation, self._accumulate(activation, current))
+        return np.nan_to_num(cuts, nan=0.0)
+
+    def compute(self, x):
+        """
+        x: matriz (N, entradas) → N saídas crisp (centroide)
+        NaN nas linhas em que a saída fica vazia (o skfuzzy lança exceção)
+        """
+        cuts = self.activations(x)
+        universe, mfs = self.universe, self.term_mfs
+        n = len(cuts)
+
+        # Pontos de corte: onde cada termo cruza o seu nível (mesma regra do skfuzzy);
+        # segmentos sem cruzamento repetem um ponto do universo (duplicatas não mudam a área)
+        left, right = mfs[:, :-1], mfs[:, 1:]
+        level = cuts[:, :, None]
+        above_left = np.where(level == 0, left > level, left >= level)
+        above_right = np.where(level == 0, right > level, right >= level)
+        crossing = above_left != above_right
+        with np.errstate(divide='ignore', invalid='ignore'):
+            points = universe[:-1] + (level - left) * (universe[1:] - universe[:-1]) / (right - left)
+        points = np.where(crossing, points, universe[:-1])
+        xs = np.sort(np.concatenate([np.broadcast_to(universe, (n, len(universe))),
+                                     points.reshape(n, -1)], axis=1), axis=1)
+
+        # União dos termos cortados, avaliada nos pontos (interpolação linear)
+        ys = np.zeros_like(xs)
+        for term, mf in enumerate(mfs):
+            np.maximum(ys, np.minimum(cuts[:, term:term + 1], np.interp(xs, universe, mf)), out=ys)
+
+        # Centroide exato de cada trapézio entre pontos consecutivos
+        x1, x2, y1, y2 = xs[:, :-1], xs[:, 1:], ys[:, :-1], ys[:, 1:]
+        width = x2 - x1
+        height = y1 + y2
+        area = 0.5 * width * height
+        with np.errstate(divide='ignore', invalid='ignore'):
+            moment = np.where(height > 0, x1 + width * (y1 + 2 * y2) / (3 * height), 0.0)
+        total = area.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, (moment * area).sum(axis=1) / total, np.nan)
+
+
+def input_grid(engine, step, offset=0.0):
+    """Grade regular (pontos, entradas) sobre os universos das entradas, passo step"""
+    axes = [np.arange(universe[0] + offset, universe[-1] + 1e-9, step) for universe in engine._universes]
+    return np.stack([axis.ravel() for axis in np.meshgrid(*axes, indexing='ij')], axis=1)
+
+
+def batched(func, x, chunk=20000):
+    """Aplica func em blocos de linhas (limita a memória intermediária do Mamdani)"""
+    return np.concatenate([func(x[k:k + chunk]) for k in range(0, len(x), chunk)])
+
+
+class SugenoEngine:
+    """
+    Aproximação Takagi-Sugeno de ordem zero de um MamdaniEngine
+
+    Mesmos antecedentes e regras; cada regra tem uma saída constante e o
+    resultado é a média ponderada pelos disparos (sem varrer o universo da
+    saída). As constantes são ajustadas por mínimos quadrados contra as
+    saídas do Mamdani numa grade de entradas. Onde nenhuma regra dispara a
+    saída é NaN, exatamente como no Mamdani.
+    """
+
+    def __init__(self, mamdani, constants):
+        self.mamdani = mamdani
+        self.constants = constants
+        # Peso do consequente de cada regra (disparo * peso, como na ativação Mamdani)
+        self.weights = np.array([consequents[0][1] if consequents else 0.0
+                                 for _, consequents in mamdani.rules], dtype=np.float64)
+        self._weight_list = self.weights.tolist()
+        # Cópias em listas Python para compute_one (uma linha sem overhead de NumPy)
+        self._universe_lists = [universe.tolist() for universe in mamdani._universes]
+        self._mf_lists = {key: mf.tolist() for key, mf in mamdani._input_mfs.items()}
+        self._python_ops = {np.fmin: min, np.fmax: max}
+
+    @classmethod
+    def fit(cls, mamdani, step=25.0, x=None):
+        """Ajusta as constantes na grade input_grid(step) (ou nas linhas de x)"""
+        x = input_grid(mamdani, step) if x is None else np.atleast_2d(np.asarray(x, dtype=np.float64))
+        target = batched(mamdani.compute, x)
+        approx = cls(mamdani, np.zeros(len(mamdani.rules)))
+        weights = approx._weights(x)
+        total = weights.sum(axis=1)
+        valid = ~np.isnan(target) & (total > 0)
+        approx.constants = np.linalg.lstsq(weights[valid] / total[valid, None], target[valid], rcond=None)[0]
+        return approx
+
+    def _membership(self, key, value):
+        universe = self._universe_lists[key[0]]
+        mf = self._mf_lists[key]
+        if value <= universe[0]:
+            return mf[0]
+        if value >= universe[-1]:
+            return mf[-1]
+        i = bisect_right(universe, value) - 1
+        return mf[i] + (value - universe[i]) * (mf[i + 1] - mf[i]) / (universe[i + 1] - universe[i])
+
+    def _evaluate_one(self, node, memberships):
+        if node[0] == 'term':
+            return memberships[node[1]]
+        if node[0] == 'not':
+            return 1.0 - self._evaluate_one(node[1], memberships)
+        op = self._python_ops.get(node[0], node[0])
+        return op(self._evaluate_one(node[1], memberships), self._evaluate_one(node[2], memberships))
+
+    def compute_one(self, values):
+        """Mesma saída de compute para uma única linha, em Python puro (laço em tempo real)"""
+        memberships = {key: self._membership(key, float(values[key[0]])) for key in self._mf_lists}
+        numerator = total = 0.0
+        for (tree, _), constant, weight in zip(self.mamdani.rules, self._constant_list, self._weight_list):
+            w = self._evaluate_one(tree, memberships) * weight
+            numerator += w * constant
+            total += w
+        return numerator / total if total > 0 else float('nan')
+
+    @property
+    def constants(self):
+        return self._constants
+
+    @constants.setter
+    def constants(self, values):
+        self._constants = np.asarray(values, dtype=np.float64)
+        self._constant_list = self._constants.tolist()
+
+    def _weights(self, x):
+        return self.mamdani.firing(x) * self.weights
+
+    def compute(self, x):
+        """x: matriz (N, entradas) → N saídas (média ponderada das constantes)"""
+        weights = self._weights(x)
+        total = weights.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, (weights @ self.constants) / total, np.nan)
+
+
+def error_report(reference, approx, x):
+    """
+    Erro de approx contra reference nas linhas de x
+    Retorna erro absoluto máximo/médio/p95, RMSE e quantas linhas têm NaN em só um dos dois
+    """
+    expected = batched(reference.compute, x)
+    actual = batched(approx.compute, x)
+    both = ~np.isnan(expected) & ~np.isnan(actual)
+    error = np.abs(actual[both] - expected[both])
+    return {
+        'points': len(x),
+        'max_error': float(error.max()) if len(error) else 0.0,
+        'mean_error': float(error.mean()) if len(error) else 0.0,
+        'p95_error': float(np.percentile(error, 95)) if len(error) else 0.0,
+        'rmse': float(np.sqrt(np.mean(error ** 2))) if len(error) else 0.0,
+        'nan_mismatches': int(np.count_nonzero(np.isnan(expected) != np.isnan(actual))),
+    }
+
+
+def benchmark(fit_step=25.0, report_step=20.0):
+    """Ajusta o Sugeno da direção (fuzzy.py), mede o erro numa grade densa deslocada e a latência"""
+    import time
+    import fuzzy
+
+    mamdani = fuzzy.steering_engine
+    t0 = time.perf_counter()
+    sugeno = SugenoEngine.fit(mamdani, step=fit_step)
+    print(f"ajuste (grade passo {fit_step:g}): {time.perf_counter() - t0:.2f}s")
+    print("constantes por regra:", np.round(sugeno.constants, 3))
+    # Grade deslocada de meio passo: pontos que o ajuste não viu
+    print("erro:", error_report(mamdani, sugeno, input_grid(mamdani, report_step, offset=report_step / 2)))
+
+    x = np.random.default_rng(0).uniform(0, 200, (20000, len(mamdani.input_labels)))
+    for name, engine in (("mamdani", mamdani), ("sugeno", sugeno)):
+        single_row = getattr(engine, 'compute_one', lambda row: engine.compute(row[None])[0])
+        t0 = time.perf_counter()
+        for row in x[:500]:
+            single_row(row)
+        single = (time.perf_counter() - t0) / 500
+        t0 = time.perf_counter()
+        engine.compute(x)
+        batch = (time.perf_counter() - t0) / len(x)
+        print(f"{name:>8}: {single * 1e6:.0f}µs/linha isolada | {batch * 1e6:.2f}µs/linha em lote")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,274 @@
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from fuzzy_sampling import sample_pointwise, system_hash
+
+# Dados de referência (saídas do skfuzzy) ficam junto do cache da tabela de fuzzy_battery
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+class Engine:
+    """
+    Implementação alternativa de um controlador
+    single(*entradas) → saída de uma chamada; batch(matriz (N, entradas)) → N
+    saídas (opcional). tolerance: erro máximo aceito em cada ponto (decisões:
+    0, qualquer troca falha), com o motivo em reason; max_points limita os
+    pontos verificados (engines lentos, como o próprio skfuzzy);
+    integer_inputs=True verifica só os pontos de entradas inteiras (o
+    domínio em que o engine é exato)
+    """
+
+    def __init__(self, single, batch=None, tolerance=0.0, reason="", max_points=None, integer_inputs=False):
+        self.single = single
+        self.batch = batch
+        self.tolerance = tolerance
+        self.reason = reason
+        self.max_points = max_points
+        self.integer_inputs = integer_inputs
+
+
+class Controller:
+    """
+    Controlador a validar: entradas e universos, referência skfuzzy em lote
+    (reference, NaN onde não há saída) e a regra de saída da aplicação
+    (output: valor → o que o jogo usa, aplicando o fallback do except)
+    grid_points e random_samples: amostragem padrão da referência
+    """
+
+    def __init__(self, name, labels, universes, digest, reference, output, fallback, engines,
+                 grid_points=9, random_samples=10000):
+        self.name = name
+        self.labels = labels
+        self.universes = universes
+        self.digest = digest
+        self.reference = reference
+        self.output = output
+        self.fallback = fallback
+        self.engines = engines
+        self.grid_points = grid_points
+        self.random_samples = random_samples
+
+
+def steering_controller():
+    """fuzzy.steering_sim; fallback de game.py: ângulo 0"""
+    import fuzzy
+    from fuzzy_cache import steering_cache
+    variables = [getattr(fuzzy, label) for label in fuzzy.SENSORS]
+
+    def reference(x):
+        # ~8ms por ponto (o vetorizado leva ~25ms por ponto com 5 entradas)
+        return sample_pointwise(fuzzy.steering_ctrl, fuzzy.SENSORS, x, 'steering')
+
+    def output(value):
+        return 0.0 if math.isnan(value) else value
+
+    def single_engine(controller):
+        # Função crua do cache (sem memoização): mesma conversão para float e NaN de steering_cache
+        return steering_cache(controller=controller).func
+
+    # Sem engine 'skfuzzy': a referência já é o steering_sim ponto a ponto, compará-lo com ela não testa nada
+    return Controller(
+        'steering', fuzzy.SENSORS, [variable.universe for variable in variables],
+        system_hash(variables + [fuzzy.steering], fuzzy.rules), reference, output, 0.0, {
+            'mamdani': Engine(single_engine('mamdani'), fuzzy.steering_engine.compute, tolerance=1e-9,
+                              reason="mesmo centroide do skfuzzy, só arredondamento de ponto flutuante"),
+            'sugeno': Engine(single_engine('sugeno'), fuzzy.steering_sugeno.compute, tolerance=3.0,
+                             reason="aproximação (máx. ~2.6° medido); o cache com quantum=1 de game.py "
+                                    "já muda a saída do Mamdani em até ~7° entre pixels vizinhos"),
+        }, grid_points=5, random_samples=3000)
+
+
+def decision_controller():
+    """fuzzy_battery.decide_goal; fallback do except: "recharge" """
+    import fuzzy_battery
+
+    variables = [getattr(fuzzy_battery, label) for label in fuzzy_battery.TABLE_INPUTS]
+
+    def reference(x):
+        return fuzzy_battery.sample_priority(*x.T)
+
+    def output(value):
+        return "end" if value >= 50 else "recharge"
+
+    table = fuzzy_battery.compiled_table()
+    return Controller(
+        'decision', fuzzy_battery.TABLE_INPUTS, [variable.universe for variable in variables],
+        fuzzy_battery.rules_hash(), reference, output, fuzzy_battery.FALLBACK, {
+            'skfuzzy': Engine(fuzzy_battery.decide_goal, tolerance=0, max_points=500,
+                              reason="decide_goal (simulação escalar e except) contra a referência "
+                                     "vetorizada com o filtro de regras disparadas"),
+            'table': Engine(lambda b, c, g: table.decide(b, c, g), lambda x: table.decide(*x.T),
+                            tolerance=0, integer_inputs=True,
+                            reason="exata nos pontos inteiros, onde gameNew a consulta; "
+                                   "fora da grade o erro é medido por fuzzy_battery.verify_table"),
+        }, grid_points=21, random_samples=10000)
+
+
+def sample_points(universes, grid_points=9, random_samples=10000, seed=0):
+    """
+    Pontos de teste: grade regular com grid_points valores por entrada (cobrindo
+    cada universo de ponta a ponta) seguida de random_samples pontos uniformes
+    Retorna (matriz (N, entradas), máscara dos pontos da grade)
+    """
+    axes = [np.linspace(universe[0], universe[-1], grid_points) for universe in universes]
+    grid = np.stack([axis.ravel() for axis in np.meshgrid(*axes, indexing='ij')], axis=1)
+    rng = np.random.default_rng(seed)
+    random = np.stack([rng.uniform(universe[0], universe[-1], random_samples) for universe in universes],
+                      axis=1)
+    on_grid = np.zeros(len(grid) + random_samples, dtype=bool)
+    on_grid[:len(grid)] = True
+    return np.concatenate([grid, random]), on_grid
+
+
+def golden(controller, grid_points=None, random_samples=None, seed=0, cache_dir=CACHE_DIR):
+    """
+    Dados de referência do controlador: pontos, saída do skfuzzy (NaN = fallback)
+    e máscara da grade (None: amostragem padrão do controlador). Gravados em
+    cache_dir com o hash do sistema e os parâmetros de amostragem no nome:
+    mudou uma regra, a referência é refeita
+    """
+    grid_points = grid_points or controller.grid_points
+    random_samples = random_samples or controller.random_samples
+    path = None
+    if cache_dir is not None:
+        name = f"golden_{controller.name}_{controller.digest[:16]}_{grid_points}_{random_samples}_{seed}.npz"
+        path = os.path.join(cache_dir, name)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return data['x'], data['expected'], data['on_grid']
+
+    x, on_grid = sample_points(controller.universes, grid_points, random_samples, seed)
+    expected = controller.reference(x)
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'wb') as file:
+            np.savez(file, x=x, expected=expected, on_grid=on_grid)
+        os.replace(temp, path)
+    return x, expected, on_grid
+
+
+def _errors(controller, expected, actual):
+    """Erro por ponto entre saídas da aplicação: diferença absoluta (números) ou 0/1 (decisões)"""
+    expected = [controller.output(value) for value in expected]
+    if isinstance(controller.fallback, str):
+        return np.array([float(e != a) for e, a in zip(expected, actual)])
+    return np.abs(np.array(expected) - np.array(actual, dtype=np.float64))
+
+
+def check(controller, engine, x, expected, on_grid):
+    """
+    Compara um engine com a referência na grade e nos pontos aleatórios
+    Passa só se todos os pontos ficam dentro da tolerância. Pontos de
+    fallback (sem saída no skfuzzy) são contados à parte: o engine tem que
+    cair no mesmo fallback, e só neles
+    """
+    if engine.integer_inputs:
+        keep = np.all(x == np.floor(x), axis=1)
+        x, expected, on_grid = x[keep], expected[keep], on_grid[keep]
+    if engine.max_points is not None and engine.max_points < len(x):
+        # Subconjunto fixo com grade e aleatórios, incluindo todos os tipos de ponto
+        keep = np.random.default_rng(0).choice(len(x), engine.max_points, replace=False)
+        keep.sort()
+        x, expected, on_grid = x[keep], expected[keep], on_grid[keep]
+
+    if engine.batch is not None:
+        raw = engine.batch(x)
+    else:
+        raw = [engine.single(*(float(v) for v in row)) for row in x]
+    if isinstance(controller.fallback, str):
+        actual = list(raw)
+        engine_fallback = None
+    else:
+        raw = np.asarray(raw, dtype=np.float64)
+        actual = [controller.output(value) for value in raw]
+        engine_fallback = np.isnan(raw)
+
+    errors = _errors(controller, expected, actual)
+    failed = errors > engine.tolerance
+    fallback = np.isnan(expected)
+    if engine_fallback is not None:
+        # Um NaN no lugar errado vira 0 e pode cair dentro da tolerância: conta como falha
+        failed |= fallback != engine_fallback
+    report = {'points': len(x), 'tolerance': engine.tolerance}
+    for part, mask in (('grid', on_grid), ('random', ~on_grid)):
+        report[f'{part}_max_error'] = float(errors[mask].max()) if mask.any() else 0.0
+        report[f'{part}_failures'] = int(np.count_nonzero(failed & mask))
+    if engine_fallback is not None:
+        fallback = fallback | engine_fallback
+    report['fallback_points'] = int(np.count_nonzero(np.isnan(expected)))
+    report['fallback_failures'] = int(np.count_nonzero(failed & fallback))
+    report['failures'] = int(np.count_nonzero(failed))
+    report['passed'] = report['failures'] == 0
+    return report
+
+
+def latency(engine, x, calls=2000):
+    """Latência por chamada (µs: p50, p90, p99, máx.) e vazão (chamadas/s e pontos/s em lote)"""
+    calls = min(calls, len(x), engine.max_points or calls)
+    rows = [tuple(float(v) for v in row) for row in x[:calls]]
+    single = engine.single
+    times = np.empty(len(rows))
+    clock = time.perf_counter_ns
+    for k, row in enumerate(rows):
+        t0 = clock()
+        single(*row)
+        times[k] = clock() - t0
+    times /= 1000
+    report = {
+        'calls': len(rows),
+        'p50_us': float(np.percentile(times, 50)),
+        'p90_us': float(np.percentile(times, 90)),
+        'p99_us': float(np.percentile(times, 99)),
+        'max_us': float(times.max()),
+        'calls_per_s': len(rows) / (times.sum() / 1e6),
+    }
+    if engine.batch is not None:
+        t0 = time.perf_counter()
+        engine.batch(x)
+        report['batch_points_per_s'] = len(x) / (time.perf_counter() - t0)
+    return report
+
+
+def run(controllers=None, grid_points=None, random_samples=None, seed=0):
+    """
+    Valida todos os engines de cada controlador contra a referência e mede a latência
+    grid_points/random_samples=None usam a amostragem padrão de cada controlador
+    Retorna True se todos ficaram dentro da tolerância
+    """
+    controllers = controllers or (steering_controller, decision_controller)
+    passed = True
+    for factory in controllers:
+        controller = factory()
+        t0 = time.perf_counter()
+        x, expected, on_grid = golden(controller, grid_points, random_samples, seed)
+        print(f"{controller.name}: {len(x)} pontos de referência ({np.count_nonzero(on_grid)} na grade, "
+              f"{np.count_nonzero(np.isnan(expected))} sem saída → {controller.fallback!r}) "
+              f"em {time.perf_counter() - t0:.1f}s", flush=True)
+        for name, engine in controller.engines.items():
+            report = check(controller, engine, x, expected, on_grid)
+            # Latência nos pontos aleatórios (arredondados, se o engine só aceita entradas inteiras)
+            timing_points = x[~on_grid]
+            if engine.integer_inputs:
+                timing_points = np.floor(timing_points + 0.5)
+            timing = latency(engine, timing_points)
+            passed = passed and report['passed']
+            batch = timing.get('batch_points_per_s')
+            print(f"  {name:>8}: {'ok' if report['passed'] else 'FALHOU'} "
+                  f"(tol {engine.tolerance:g}: {engine.reason}) | {report['points']} pontos | "
+                  f"erro máx. grade {report['grid_max_error']:.3g} "
+                  f"/ aleatório {report['random_max_error']:.3g} | "
+                  f"falhas {report['grid_failures']}+{report['random_failures']} "
+                  f"(fallback {report['fallback_failures']}/{report['fallback_points']}) | "
+                  f"p50 {timing['p50_us']:.1f}µs p99 {timing['p99_us']:.1f}µs | "
+                  f"{timing['calls_per_s']:.0f} chamadas/s"
+                  + (f" | lote {batch:.0f} pontos/s" if batch else ""), flush=True)
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,89 @@
+import hashlib
+import warnings
+
+import numpy as np
+
+_SAMPLE_CHUNK = 4096
+
+
+def firing_strength(antecedent, inputs):
+    """Grau de ativação de um antecedente do skfuzzy (AND = fmin, OR = fmax, NOT = 1 - x) em lote"""
+    from skfuzzy.control.term import Term
+    if isinstance(antecedent, Term):
+        variable = antecedent.parent
+        return np.interp(inputs[variable.label], variable.universe, antecedent.mf)
+    first = firing_strength(antecedent.term1, inputs)
+    if antecedent.kind == 'not':
+        return 1.0 - first
+    second = firing_strength(antecedent.term2, inputs)
+    return np.fmin(first, second) if antecedent.kind == 'and' else np.fmax(first, second)
+
+
+def sample_system(system, rules, inputs, output, chunk=_SAMPLE_CHUNK):
+    """
+    Saída do skfuzzy (ControlSystem) para muitos pontos de uma vez (simulação vetorizada)
+    inputs: {rótulo: array}. Pontos em que nenhuma regra dispara (o skfuzzy
+    lança exceção e o código do jogo cai no fallback) viram NaN
+    """
+    from skfuzzy import control as ctrl
+    inputs = dict(zip(inputs, np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64).ravel() for v in inputs.values()))))
+    fired = np.zeros(len(next(iter(inputs.values()))), dtype=bool)
+    for rule in rules:
+        fired |= firing_strength(rule.antecedent, inputs) > 0
+
+    result = np.full(len(fired), np.nan)
+    todo = np.flatnonzero(fired)
+    sim = ctrl.ControlSystemSimulation(system)
+    pending = [todo[k:k + chunk] for k in range(0, len(todo), chunk)]
+    while pending:
+        part = pending.pop()
+        try:
+            with warnings.catch_warnings():
+                # Lotes de tamanhos diferentes: o skfuzzy avisa, mas todas as entradas são trocadas
+                warnings.simplefilter('ignore', UserWarning)
+                sim.inputs({name: values[part] for name, values in inputs.items()})
+                sim.compute()
+            result[part] = sim.output[output]
+        except Exception:
+            # Algum ponto sem saída que o filtro acima não previu: divide o lote
+            if len(part) > 1:
+                pending += [part[:len(part) // 2], part[len(part) // 2:]]
+    return result
+
+
+def sample_pointwise(system, labels, x, output):
+    """
+    Mesma saída de sample_system, um ponto por vez (try/except de cada chamada)
+    Com muitas entradas e regras o skfuzzy vetorizado fica mais lento que o laço
+    """
+    from skfuzzy import control as ctrl
+    sim = ctrl.ControlSystemSimulation(system)
+    result = np.full(len(x), np.nan)
+    for k, row in enumerate(x):
+        for label, value in zip(labels, row):
+            sim.input[label] = value
+        try:
+            sim.compute()
+            result[k] = sim.output[output]
+        except Exception:
+            pass
+    return result
+
+
+def system_hash(variables, rules):
+    """
+    Hash do sistema: universos, funções de pertinência, regras e a
+    defuzzificação do consequente (a última variável)
+    """
+    digest = hashlib.sha256()
+    for variable in variables:
+        digest.update(variable.label.encode())
+        digest.update(np.ascontiguousarray(variable.universe, dtype=np.float64).tobytes())
+        for label, term in sorted(variable.terms.items()):
+            digest.update(label.encode())
+            digest.update(np.ascontiguousarray(term.mf, dtype=np.float64).tobytes())
+    for rule in rules:
+        digest.update(str(rule).encode())
+    digest.update(str(variables[-1].defuzzify_method).encode())
+    return digest.hexdigest()
@@ -1,6 +1,10 @@
+import os
+import sys
 import pygame
 import math
-import fuzzy
+from fuzzy_cache import steering_cache
+from maze import Maze
+from sensors import GridRaycaster
 
 pygame.init()
 screen = pygame.display.set_mode((1280, 720))
@@ -19,22 +23,19 @@ robot_surf.fill((255, 0, 0))
 
 sensor_angles = [0, -90, 90, -45, 45]
 sensor_range = 200
-
-map_str = """
-S . . █ # . █ . . █
-# . # . # . . . . .
-█ . # . . # . . # █
-. # . # # █ . . . .
-█ . . . . . . . █ █
-. . # . . █ # . . #
-█ . . . # . # # # █
-. . . . # . # # █ .
-█ █ . . # . . . . █
-. █ # . █ # # █ # E
-"""
-
-maze = [row.split() for row in map_str.strip().split("\n")]
+# As leituras dos sensores são reais, mas quantizadas ao pixel (quantum=1) se
+# repetem entre quadros: memoiza a direção
+# Controlador escolhido na linha de comando (python game.py sugeno) e trocado com TAB
+controllers = {name: steering_cache(controller=name) for name in ("mamdani", "sugeno", "skfuzzy")}
+controller = sys.argv[1] if len(sys.argv) > 1 else "mamdani"
+if controller not in controllers:
+    pygame.quit()
+    sys.exit(f"uso: python game.py [{'|'.join(controllers)}]")
+steer = controllers[controller]
+
+maze = Maze.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps", "game.txt")).grid
 tile_size = 100
+raycaster = GridRaycaster(maze, tile_size)
 
 colors = {
     "█": (0, 0, 0),
@@ -48,6 +49,11 @@ while running:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+            names = list(controllers)
+            controller = names[(names.index(controller) + 1) % len(names)]
+            steer = controllers[controller]
+            print(f"Controlador: {controller}")
 
     keys = pygame.key.get_pressed()
     if keys[pygame.K_a]:
@@ -67,47 +73,25 @@ while running:
     rect = rotated_robot.get_rect(center=player_pos)
     screen.blit(rotated_robot, rect)
 
-    sensor_distances = []
+    # Distância exata até a primeira parede (ou borda do mapa) por sensor; raios que
+    # raspam uma quina param nela (a marcha pixel a pixel antiga passava na diagonal)
+    sensor_distances = raycaster.sense(player_pos.x, player_pos.y, degree, sensor_angles, sensor_range)
     
-    for angle_offset in sensor_angles:
+    for angle_offset, distance in zip(sensor_angles, sensor_distances):
         angle = degree + angle_offset
         dx = math.cos(math.radians(angle))
         dy = -math.sin(math.radians(angle))
-        
-        distance = sensor_range
-        for d in range(sensor_range):
-            test_x = int(player_pos.x + dx*d)
-            test_y = int(player_pos.y + dy*d)
-            cell_x = test_x // tile_size
-            cell_y = test_y // tile_size
-
-            if 0 <= cell_y < len(maze) and 0 <= cell_x < len(maze[0]):
-                if maze[cell_y][cell_x] == "█":
-                    distance = d
-                    break
-            else:
-                distance = d
-                break
-                
-        sensor_distances.append(distance)
                 
         end_pos = (player_pos.x + dx*distance, player_pos.y + dy*distance)
         pygame.draw.line(screen, (0, 255, 0), player_pos, end_pos, 2)
 
         font = pygame.font.SysFont(None, 24)
-        text = font.render(f"{distance}", True, (0, 0, 0))
+        text = font.render(f"{distance:.0f}", True, (0, 0, 0))
         screen.blit(text, end_pos)
     
     if len(sensor_distances) == 5:
-        fuzzy.steering_sim.input['front'] = sensor_distances[0]
-        fuzzy.steering_sim.input['right'] = sensor_distances[1]
-        fuzzy.steering_sim.input['left'] = sensor_distances[2]
-        fuzzy.steering_sim.input['diag_right'] = sensor_distances[3]
-        fuzzy.steering_sim.input['diag_left'] = sensor_distances[4]
-        try:
-            fuzzy.steering_sim.compute()
-            steer_angle = fuzzy.steering_sim.output['steering']
-        except:
+        steer_angle = steer(*sensor_distances)
+        if math.isnan(steer_angle):
             print("Erro no cálculo fuzzy")
             steer_angle = 0
         print(f"Steer angle: {steer_angle}")
@@ -128,3 +112,5 @@ while running:
     clock.tick(60)
 
 pygame.quit()
+for name, cache in controllers.items():
+    print(f"Cache de direção ({name}): {cache.stats()}")
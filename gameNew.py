@@ -1,7 +1,10 @@
+import sys
 import pygame
-import heapq
 import maze
-from fuzzy_battery import decide_goal
+from aStar import AStar
+from adjacency import GridAdjacency
+from dstar_lite import DStarLite
+from fuzzy_cache import decision_cache
 import numpy as np
 
 pygame.init()
@@ -44,56 +47,63 @@ known_map[start[1]][start[0]] = "S"
 for cx, cy in chargers:
     known_map[cy][cx] = "#"
 
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+def known_costs(known_map):
+    # Células desconhecidas são otimistas: só paredes conhecidas bloqueiam
+    return [[0 if cell == "█" else 1 for cell in row] for row in known_map]
 
-def neighbors(pos, known_map):
+planner = AStar(maze_obj)
+known_adj = GridAdjacency(known_costs(known_map))
+
+# Um planejador D* Lite por objetivo (saída/carregadores), reparado a cada
+# célula revelada em vez de refazer a busca do zero
+incremental = {}
+# Depuração: python gameNew.py --compare-replan roda também um A* completo a cada
+# replanejamento (dobra o custo) para mostrar a economia do D* Lite no HUD
+compare_full_replan = "--compare-replan" in sys.argv
+replan_stats = []  # (nós tocados no reparo, nós de um A* completo)
+
+def reveal(known_map, pos, cell):
     x, y = pos
-    steps = [(1,0), (-1,0), (0,1), (0,-1)]
-    result = []
-    for dx, dy in steps:
-        nx, ny = x + dx, y + dy
-        if 0 <= ny < len(known_map) and 0 <= nx < len(known_map[0]):
-            if known_map[ny][nx] != "█":
-                result.append((nx, ny))
-    return result
-
-def astar(start, goal, known_map):
-    open_set = []
-    heapq.heappush(open_set, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-
-    while open_set:
-        _, current = heapq.heappop(open_set)
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
-            return path
-
-        for n in neighbors(current, known_map):
-            tentative_g = g_score[current] + 1
-            if n not in g_score or tentative_g < g_score[n]:
-                came_from[n] = current
-                g_score[n] = tentative_g
-                f_score[n] = tentative_g + heuristic(n, goal)
-                heapq.heappush(open_set, (f_score[n], n))
-    return None
+    if known_map[y][x] != cell:
+        known_map[y][x] = cell
+        cost = 0 if cell == "█" else 1
+        known_adj.update_cell(y, x, cost)
+        for dstar in incremental.values():
+            dstar.update_cell(y, x, cost)
+
+def nearest_by_path(start, goals):
+    # Uma única busca multi-objetivo no mapa conhecido: custo real, não Manhattan
+    found, goal, _, cost, _ = planner.search_nearest([(gy, gx) for gx, gy in goals],
+                                                     start=(start[1], start[0]), adjacency=known_adj)
+    if not found:
+        return None, 999
+    return (goal[1], goal[0]), cost
+
+def replan(start, goal, known_map):
+    dstar = incremental.get(goal)
+    if dstar is None:
+        dstar = incremental[goal] = DStarLite(known_costs(known_map), (start[1], start[0]), (goal[1], goal[0]))
+    dstar.move_to((start[1], start[0]))
+    path = dstar.path()
+
+    if compare_full_replan:
+        full_nodes = planner.search_array(start=(start[1], start[0]), goal=(goal[1], goal[0]),
+                                          adjacency=known_adj)[3]
+        replan_stats.append((dstar.last_expansions, full_nodes))
+
+    if path is None:
+        return None
+    return [(x, y) for y, x in path]
 
 def sense_environment(real_map, known_map, pos):
     x, y = pos
     for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
         nx, ny = x + dx, y + dy
         if 0 <= ny < len(real_map) and 0 <= nx < len(real_map[0]):
-            known_map[ny][nx] = real_map[ny][nx]
+            reveal(known_map, (nx, ny), real_map[ny][nx])
             
 def reset_game():
-    global maze_map, known_map, start, end, chargers
+    global maze_map, known_map, start, end, chargers, planner, known_adj, incremental
     global player_tile, player_pos, path, current_tile_index
     global battery_level, is_charging, goal_type, target_goal
 
@@ -116,6 +126,11 @@ def reset_game():
     for cx, cy in chargers:
         known_map[cy][cx] = "#"
 
+    planner = AStar(maze_obj)
+    known_adj = GridAdjacency(known_costs(known_map))
+    incremental = {}
+    replan_stats.clear()
+
     player_tile = start
     player_pos = pygame.Vector2((start[0] + 0.5) * tile_size, (start[1] + 0.5) * tile_size)
     path = []
@@ -140,14 +155,15 @@ battery_charge_rate = 0.6
 is_charging = False
 charging_target = None
 goal_type = "end"
+# A tabela compilada só é exata nos pontos inteiros: as entradas são arredondadas
+# na chamada (a bateria cai em passos fracionários)
+decide = decision_cache(compiled=True)
 
 while running:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
 
-    px, py = player_tile
-    
     if player_tile == end:
         reset_game()
         continue
@@ -159,17 +175,16 @@ while running:
             charging_target = None
     else:
         battery_level = max(0.0, battery_level - battery_drain_rate)
-        distances = [abs(px - cx) + abs(py - cy) for (cx, cy) in chargers] if chargers else [999]
-        closest_dist = min(distances)
-        distance_to_end = min(20, abs(px - end[0]) + abs(py - end[1]))
+        closest_charger, closest_dist = nearest_by_path(player_tile, chargers)
+        distance_to_end = min(20, nearest_by_path(player_tile, [end])[1])
         try:
-            goal_type = decide_goal(battery_level, closest_dist, distance_to_end)
+            goal_type = decide(round(battery_level), round(closest_dist), round(distance_to_end))
         except Exception as e:
             goal_type = "recharge"
-        target_goal = end if goal_type == "end" else min(chargers, key=lambda c: abs(px - c[0]) + abs(py - c[1]))
+        target_goal = end if goal_type == "end" or closest_charger is None else closest_charger
 
         if not path or target_goal != (path[-1] if path else None):
-            path = astar(player_tile, target_goal, known_map)
+            path = replan(player_tile, target_goal, known_map)
             current_tile_index = 0
 
     if not is_charging and path and current_tile_index < len(path) - 1:
@@ -177,8 +192,8 @@ while running:
         nx, ny = next_tile
 
         if maze_map[ny][nx] == "█":
-            known_map[ny][nx] = "█"
-            path = astar(player_tile, target_goal, known_map)
+            reveal(known_map, next_tile, "█")
+            path = replan(player_tile, target_goal, known_map)
             current_tile_index = 0
         else:
             target_pos = pygame.Vector2((nx + 0.5) * tile_size, (ny + 0.5) * tile_size)
@@ -237,7 +252,13 @@ while running:
     text = font.render(f"{status} | Bateria: {battery_level:.1f}%", True, (0, 0, 0))
     screen.blit(text, (50, 90))
 
+    if compare_full_replan and replan_stats:
+        touched, full_nodes = replan_stats[-1]
+        text = font.render(f"Replanejamento: {touched} nós (A* completo: {full_nodes})", True, (0, 0, 0))
+        screen.blit(text, (50, 120))
+
     pygame.display.flip()
     clock.tick(60)
 
 pygame.quit()
+print(f"Cache de decisão: {decide.stats()}")
@@ -0,0 +1,309 @@
+import heapq
+import random
+import time
+
+from aStar import AStar
+
+
+class HierarchicalAStar:
+    """
+    Pathfinding hierárquico (HPA*) para labirintos grandes
+
+    A grade é dividida em clusters de cluster_size x cluster_size. Em cada
+    borda entre clusters vizinhos são escolhidas entradas (pares de células
+    transitáveis dos dois lados) e, dentro de cada cluster, são pré-calculados
+    os custos entre as suas entradas. A consulta busca primeiro no grafo
+    abstrato de entradas e só depois refina o caminho dentro dos clusters
+    escolhidos. O resultado é quase ótimo (as entradas restringem os cruzamentos).
+
+    Usa o mesmo modelo de custo do A* (tabela de adjacência do maze).
+    """
+
+    # Bordas com trechos livres maiores que isso ganham duas entradas (nas pontas)
+    MAX_SINGLE_ENTRANCE = 6
+
+    def __init__(self, maze, cluster_size=16):
+        self.maze = maze
+        self.rows = maze.rows
+        self.cols = maze.cols
+        self.cluster_size = cluster_size
+        self.cluster_rows = (self.rows + cluster_size - 1) // cluster_size
+        self.cluster_cols = (self.cols + cluster_size - 1) // cluster_size
+
+        self.borders = {}         # (cluster1, cluster2) -> [(célula1, célula2)]
+        self.cluster_nodes = {}   # cluster -> entradas dentro dele
+        self.inter_edges = {}     # entrada -> {entrada do cluster vizinho: custo}
+        self.intra_edges = {}     # entrada -> {entrada do mesmo cluster: custo}
+        self.build()
+
+    @property
+    def adjacency(self):
+        return self.maze.adjacency
+
+    def cluster_of(self, node):
+        row, col = divmod(node, self.cols)
+        return (row // self.cluster_size, col // self.cluster_size)
+
+    def _cluster_bounds(self, cluster):
+        r0 = cluster[0] * self.cluster_size
+        c0 = cluster[1] * self.cluster_size
+        return r0, min(r0 + self.cluster_size, self.rows), c0, min(c0 + self.cluster_size, self.cols)
+
+    def _neighbor_clusters(self, cluster):
+        cr, cc = cluster
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            if 0 <= cr + dr < self.cluster_rows and 0 <= cc + dc < self.cluster_cols:
+                yield (cr + dr, cc + dc)
+
+    def build(self):
+        """Constrói entradas e arestas intra-cluster de toda a grade"""
+        self.borders.clear()
+        self.cluster_nodes = {(cr, cc): set() for cr in range(self.cluster_rows)
+                              for cc in range(self.cluster_cols)}
+        self.inter_edges.clear()
+        self.intra_edges.clear()
+
+        for cluster in self.cluster_nodes:
+            for other in self._neighbor_clusters(cluster):
+                if cluster < other:
+                    self._build_border(cluster, other)
+        for cluster in self.cluster_nodes:
+            self._build_intra(cluster)
+
+    def _border_cells(self, cluster1, cluster2):
+        """Pares de células (lado 1, lado 2) ao longo da borda entre dois clusters vizinhos"""
+        r0, r1, c0, c1 = self._cluster_bounds(cluster1)
+        cols = self.cols
+        if cluster2[0] == cluster1[0]:
+            # Borda vertical: última coluna de cluster1 / primeira de cluster2
+            return [(row * cols + c1 - 1, row * cols + c1) for row in range(r0, r1)]
+        return [((r1 - 1) * cols + col, r1 * cols + col) for col in range(c0, c1)]
+
+    def _build_border(self, cluster1, cluster2):
+        """(Re)calcula as entradas de uma borda e as arestas entre clusters"""
+        costs = self.adjacency.costs_view
+        for a, b in self.borders.get((cluster1, cluster2), []):
+            self.inter_edges.get(a, {}).pop(b, None)
+            self.inter_edges.get(b, {}).pop(a, None)
+
+        transitions = []
+        run = []
+        for a, b in self._border_cells(cluster1, cluster2) + [(None, None)]:
+            if a is not None and costs[a] > 0 and costs[b] > 0:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) > self.MAX_SINGLE_ENTRANCE:
+                    transitions.extend([run[0], run[-1]])
+                else:
+                    transitions.append(run[len(run) // 2])
+                run = []
+
+        self.borders[(cluster1, cluster2)] = transitions
+        for a, b in transitions:
+            self.inter_edges.setdefault(a, {})[b] = costs[b]
+            self.inter_edges.setdefault(b, {})[a] = costs[a]
+
+    def _collect_cluster_nodes(self, cluster):
+        nodes = set()
+        for other in self._neighbor_clusters(cluster):
+            if cluster < other:
+                nodes.update(a for a, _ in self.borders.get((cluster, other), []))
+            else:
+                nodes.update(b for _, b in self.borders.get((other, cluster), []))
+        return nodes
+
+    def _build_intra(self, cluster):
+        """(Re)calcula os custos entre as entradas de um cluster"""
+        for node in self.cluster_nodes.get(cluster, ()):
+            self.intra_edges.pop(node, None)
+        nodes = self._collect_cluster_nodes(cluster)
+        self.cluster_nodes[cluster] = nodes
+        for node in nodes:
+            dist, _, _ = self._cluster_dijkstra(node, cluster)
+            self.intra_edges[node] = {other: dist[other] for other in nodes
+                                      if other != node and other in dist}
+
+    def _cluster_dijkstra(self, source, cluster, target=None, reverse=False):
+        """
+        Dijkstra restrito a um cluster a partir de source
+        reverse=True calcula o custo de cada célula ATÉ source
+        Retorna (distâncias, pais, nós expandidos)
+        """
+        r0, r1, c0, c1 = self._cluster_bounds(cluster)
+        cols = self.cols
+        indices = self.adjacency.indices_view
+        weights = self.adjacency.weights_view
+        costs = self.adjacency.costs_view
+
+        dist = {source: 0}
+        parent = {}
+        heap = [(0, source)]
+        expanded = 0
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            expanded += 1
+            if node == target:
+                break
+            base = node * 4
+            for k in range(base, base + 4):
+                neighbor = indices[k]
+                if neighbor < 0:
+                    continue
+                row, col = divmod(neighbor, cols)
+                if not (r0 <= row < r1 and c0 <= col < c1):
+                    continue
+                next_d = d + (costs[node] if reverse else weights[k])
+                if neighbor not in dist or next_d < dist[neighbor]:
+                    dist[neighbor] = next_d
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (next_d, neighbor))
+        return dist, parent, expanded
+
+    def update_cell(self, row, col):
+        """
+        Atualiza a hierarquia após maze.set_cell(row, col, ...): refaz só as
+        bordas do cluster da célula e as arestas internas dele e dos vizinhos
+        """
+        cluster = (row // self.cluster_size, col // self.cluster_size)
+        neighbors = list(self._neighbor_clusters(cluster))
+        for other in neighbors:
+            self._build_border(min(cluster, other), max(cluster, other))
+        for affected in [cluster] + neighbors:
+            self._build_intra(affected)
+
+    def _heuristic(self, node, goal):
+        row, col = divmod(node, self.cols)
+        goal_row, goal_col = divmod(goal, self.cols)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    def search(self, start=None, goal=None):
+        """
+        Busca hierárquica de start até goal (padrão: maze.start → maze.end)
+        Retorna: (caminho_encontrado, caminho, custo_total, nós_explorados)
+        """
+        start = self.maze.start if start is None else start
+        goal = self.maze.end if goal is None else goal
+        if start == goal:
+            return True, [start], 0, 1
+
+        cols = self.cols
+        start_node = start[0] * cols + start[1]
+        goal_node = goal[0] * cols + goal[1]
+        start_cluster = self.cluster_of(start_node)
+        goal_cluster = self.cluster_of(goal_node)
+
+        # Insere start e goal temporariamente no grafo abstrato
+        start_dist, _, explored_start = self._cluster_dijkstra(start_node, start_cluster)
+        goal_dist, _, explored_goal = self._cluster_dijkstra(goal_node, goal_cluster, reverse=True)
+        nodes_explored = explored_start + explored_goal
+
+        start_edges = {node: start_dist[node] for node in self.cluster_nodes[start_cluster]
+                       if node in start_dist}
+        if start_cluster == goal_cluster and goal_node in start_dist:
+            start_edges[goal_node] = start_dist[goal_node]
+        goal_edges = {node: goal_dist[node] for node in self.cluster_nodes[goal_cluster]
+                      if node in goal_dist}
+
+        # A* no grafo abstrato
+        g_score = {start_node: 0}
+        came_from = {}
+        closed_set = set()
+        open_set = [(self._heuristic(start_node, goal_node), start_node)]
+        found = False
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+            nodes_explored += 1
+            if current == goal_node:
+                found = True
+                break
+
+            if current == start_node:
+                edges = list(start_edges.items())
+                edges += self.inter_edges.get(current, {}).items()
+            else:
+                edges = list(self.intra_edges.get(current, {}).items())
+                edges += self.inter_edges.get(current, {}).items()
+                if current in goal_edges:
+                    edges.append((goal_node, goal_edges[current]))
+
+            for neighbor, cost in edges:
+                if neighbor in closed_set:
+                    continue
+                tentative_g_score = g_score[current] + cost
+                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                    g_score[neighbor] = tentative_g_score
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (tentative_g_score + self._heuristic(neighbor, goal_node), neighbor))
+
+        if not found:
+            return False, [], float('inf'), nodes_explored
+
+        abstract_path = [goal_node]
+        while abstract_path[-1] in came_from:
+            abstract_path.append(came_from[abstract_path[-1]])
+        abstract_path.reverse()
+
+        # Refinamento: só dentro dos clusters escolhidos
+        path = [start_node]
+        for u, v in zip(abstract_path, abstract_path[1:]):
+            if v in self.inter_edges.get(u, {}) and self.cluster_of(u) != self.cluster_of(v):
+                path.append(v)
+                continue
+            _, parent, expanded = self._cluster_dijkstra(u, self.cluster_of(u), target=v)
+            nodes_explored += expanded
+            segment = [v]
+            while segment[-1] != u:
+                segment.append(parent[segment[-1]])
+            path.extend(reversed(segment[:-1]))
+
+        return True, [divmod(node, cols) for node in path], g_score[goal_node], nodes_explored
+
+
+def benchmark(sizes=(100, 200, 400), queries=20, cluster_size=16, obstacle_prob=0.2, seed=0):
+    """Compara a latência por consulta do HPA* com AStar.search/search_array em vários tamanhos"""
+    from maze import Maze
+
+    rng = random.Random(seed)
+    print(f"{'tamanho':>9} | {'construção':>10} | {'HPA*':>9} | {'search':>9} | "
+          f"{'search_array':>12} | {'custo HPA*/ótimo':>16}")
+    for size in sizes:
+        maze = Maze(size, size, obstacle_prob=obstacle_prob, seed=seed, ensure_path=True)
+        astar = AStar(maze)
+
+        t0 = time.perf_counter()
+        hpa = HierarchicalAStar(maze, cluster_size=cluster_size)
+        build_time = time.perf_counter() - t0
+
+        free = [(r, c) for r in range(size) for c in range(size) if maze.grid[r][c] != maze.WALL]
+        pairs = [(maze.start, maze.end)] + [(rng.choice(free), rng.choice(free)) for _ in range(queries - 1)]
+
+        t0 = time.perf_counter()
+        hpa_results = [hpa.search(s, g) for s, g in pairs]
+        hpa_time = (time.perf_counter() - t0) / len(pairs)
+
+        # search() parte de astar.start/astar.end: mesmos pares, um de cada vez
+        t0 = time.perf_counter()
+        for start, goal in pairs:
+            astar.start, astar.end = start, goal
+            astar.search()
+        search_time = (time.perf_counter() - t0) / len(pairs)
+        astar.start, astar.end = maze.start, maze.end
+
+        t0 = time.perf_counter()
+        flat_results = [astar.search_array(s, g) for s, g in pairs]
+        flat_time = (time.perf_counter() - t0) / len(pairs)
+
+        ratios = [h[2] / f[2] for h, f in zip(hpa_results, flat_results) if f[0] and f[2] > 0]
+        ratio = sum(ratios) / len(ratios) if ratios else float('nan')
+        print(f"{size:>4}x{size:<4} | {build_time * 1000:>8.1f}ms | {hpa_time * 1000:>7.2f}ms | "
+              f"{search_time * 1000:>7.2f}ms | {flat_time * 1000:>10.2f}ms | {ratio:>16.3f}")
+
+
+if __name__ == "__main__":
+    benchmark()
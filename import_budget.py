@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+
+# Tempo máximo de import (ms, melhor de RUNS execuções em processo novo) e
+# módulos pesados que não podem ser carregados só por importar o módulo
+BUDGETS = {
+    'adjacency': 250,
+    'aStar': 250,
+    'maze': 250,
+    'dstar_lite': 50,
+    'hpa': 250,
+    'batch': 300,
+    'tiled_maze': 250,
+    'corpus': 300,
+    'fuzzy': 250,
+    'fuzzy_battery': 250,
+    'fuzzy_engine': 250,
+    'fuzzy_cache': 250,
+    'fuzzy_harness': 250,
+    'fuzzy_sampling': 250,
+    'sensors': 250,
+}
+FORBIDDEN = ('pygame', 'skfuzzy')
+RUNS = 5
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - t0) * 1000
+print(elapsed)
+print(','.join(name for name in {forbidden!r} if name in sys.modules))
+"""
+
+
+def measure(module, runs=RUNS):
+    """
+    Importa o módulo em processos Python novos (sem cache de import do processo)
+    Retorna (melhor tempo em ms, módulos proibidos carregados, saída extra)
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = float('inf')
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', _PROBE.format(module=module, forbidden=FORBIDDEN)],
+                                cwd=here, capture_output=True, text=True, check=True)
+        *extra, elapsed, loaded = result.stdout.split('\n')[:-1]
+        best = min(best, float(elapsed))
+    return best, [name for name in loaded.split(',') if name], extra
+
+
+def main():
+    """Mede todos os módulos e falha (código 1) se algum estourar o orçamento"""
+    failed = False
+    print(f"{'módulo':<15} | {'import':>9} | {'orçamento':>9} | situação")
+    for module, budget in BUDGETS.items():
+        elapsed, loaded, extra = measure(module)
+        problems = []
+        if elapsed > budget:
+            problems.append("lento")
+        if loaded:
+            problems.append("carrega " + ", ".join(loaded))
+        if extra:
+            problems.append("imprime ao importar")
+        failed = failed or bool(problems)
+        print(f"{module:<15} | {elapsed:>7.1f}ms | {budget:>7}ms | {'; '.join(problems) or 'ok'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,214 @@
-import random
+import heapq
 import numpy as np
-from collections import deque
+from collections import OrderedDict
+import struct
 import sys
 import os
 from aStar import AStar
+from adjacency import GridAdjacency
 
 # Add aStar directory to path
 # sys.path.append(os.path.join(os.path.dirname(__file__), 'aStar'))
 # from aStar import AStar
 
+def _flat_neighbors(cells, rows, cols):
+    """Índices planos dos vizinhos 4-conectados (dentro da grade) de um conjunto de células"""
+    row, col = np.divmod(cells, cols)
+    return np.concatenate([cells[row > 0] - cols, cells[row < rows - 1] + cols,
+                           cells[col > 0] - 1, cells[col < cols - 1] + 1])
+
+
+def _distinct(values, scratch):
+    """Remove repetições de índices em O(n) usando um vetor auxiliar do tamanho da grade"""
+    positions = np.arange(len(values))
+    scratch[values] = positions
+    return values[scratch[values] == positions]
+
+
+def _compress(parent):
+    """Pointer jumping (dobra o salto a cada passo) até todo nó apontar para a raiz"""
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent
+        parent = grandparent
+
+
+def label_components(passable):
+    """
+    Rotula as componentes 4-conectadas de uma máscara booleana
+    Union-find vetorizado: cada trecho horizontal contínuo já começa como um
+    conjunto; as arestas verticais são unidas em rodadas (raiz maior aponta
+    para a menor), comprimindo os ponteiros entre as rodadas
+    Retorna matriz int32 com o rótulo (menor índice da componente) ou -1
+    """
+    rows, cols = passable.shape
+    idx = np.arange(rows * cols, dtype=np.int32).reshape(rows, cols)
+
+    run_start = passable.copy()
+    run_start[:, 1:] &= ~passable[:, :-1]
+    parent = np.maximum.accumulate(np.where(run_start, idx, 0), axis=1).ravel()
+    blocked = ~passable.ravel()
+    parent[blocked] = idx.ravel()[blocked]
+
+    vertical = passable[:-1, :] & passable[1:, :]
+    u = idx[:-1, :][vertical]
+    v = idx[1:, :][vertical]
+    while True:
+        parent = _compress(parent)
+        root_u, root_v = parent[u], parent[v]
+        crossing = root_u != root_v
+        if not crossing.any():
+            break
+        u, v = u[crossing], v[crossing]
+        root_u, root_v = root_u[crossing], root_v[crossing]
+        np.minimum.at(parent, np.maximum(root_u, root_v), np.minimum(root_u, root_v))
+
+    labels = parent.reshape(rows, cols)
+    labels[~passable] = -1
+    return labels
+
+
+def min_wall_repair(passable, start, end, labels=None):
+    """
+    Menor conjunto de paredes a remover para ligar start a end
+    BFS 0-1 em camadas sobre as componentes: andar dentro de uma componente
+    custa 0, atravessar uma parede custa 1. Cada camada só toca as células
+    novas da camada anterior (operações vetorizadas sobre índices planos)
+    start e end precisam ser transitáveis
+    Retorna a lista de células (row, col) a liberar
+    """
+    if labels is None:
+        labels = label_components(passable)
+    if labels[start] == labels[end]:
+        return []
+
+    rows, cols = passable.shape
+    flat_labels = labels.ravel()
+    flat_passable = passable.ravel()
+    # Células agrupadas por rótulo: as de uma componente ficam num trecho contíguo
+    order = np.argsort(flat_labels, kind='stable')
+    sorted_labels = flat_labels[order]
+
+    def component_cells(component_labels):
+        lo = np.searchsorted(sorted_labels, component_labels, side='left')
+        hi = np.searchsorted(sorted_labels, component_labels, side='right')
+        lengths = hi - lo
+        offsets = np.repeat(lo - np.cumsum(lengths) + lengths, lengths)
+        return order[offsets + np.arange(lengths.sum())]
+
+    start_node = start[0] * cols + start[1]
+    end_node = end[0] * cols + end[1]
+    layer = np.full(rows * cols, -1, dtype=np.int32)
+    scratch = np.empty(rows * cols, dtype=np.int64)
+    frontier = component_cells(labels[start][None])
+    layer[frontier] = 0
+    k = 0
+    while layer[end_node] < 0:
+        k += 1
+        # Vizinhos ainda não alcançados da camada anterior são sempre paredes
+        walls = _flat_neighbors(frontier, rows, cols)
+        walls = _distinct(walls[layer[walls] < 0], scratch)
+        layer[walls] = k
+        around = _flat_neighbors(walls, rows, cols)
+        around = around[(layer[around] < 0) & flat_passable[around]]
+        touched = _distinct(flat_labels[around], scratch)
+        cells = component_cells(touched) if len(touched) else walls[:0]
+        layer[cells] = k
+        frontier = np.concatenate([walls, cells])
+
+    # Volta do end para o start: componente → parede da mesma camada → camada menor
+    layer = layer.reshape(rows, cols)
+    removed = []
+    current = layer[end]
+    region = component_cells(labels[end][None])
+    while current > 0:
+        around = _flat_neighbors(region, rows, cols)
+        wall = divmod(int(around[(~flat_passable[around]) & (layer.ravel()[around] == current)].min()), cols)
+        while True:
+            removed.append(wall)
+            row, col = wall
+            previous = [(row + dr, col + dc) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                        if 0 <= row + dr < rows and 0 <= col + dc < cols
+                        and 0 <= layer[row + dr, col + dc] < current]
+            cell = min(previous, key=lambda pos: layer[pos])
+            current = layer[cell]
+            if passable[cell]:
+                region = component_cells(labels[cell][None])
+                break
+            wall = cell
+    return removed
+
+
+# Formato binário: cabeçalho fixo + legenda (caracteres dos códigos, UTF-8),
+# alinhado em MAZE_ALIGNMENT bytes, seguido das células uint8 linha a linha
+MAZE_MAGIC = b'MAZE'
+MAZE_VERSION = 1
+MAZE_ALIGNMENT = 64
+_HEADER = struct.Struct('<4sHHqIIIIIIH')
+_HAS_SEED = 1
+
+
+def write_maze_header(file, rows, cols, start, end, seed, legend):
+    """Escreve o cabeçalho do formato binário e retorna o offset das células"""
+    has_seed = isinstance(seed, (int, np.integer)) and -2**63 <= seed < 2**63
+    legend_bytes = ''.join(legend).encode('utf-8')
+    header = _HEADER.pack(MAZE_MAGIC, MAZE_VERSION, _HAS_SEED if has_seed else 0,
+                          int(seed) if has_seed else 0, rows, cols, *start, *end, len(legend_bytes))
+    offset = -(-(len(header) + len(legend_bytes)) // MAZE_ALIGNMENT) * MAZE_ALIGNMENT
+    file.write(header + legend_bytes)
+    file.write(bytes(offset - len(header) - len(legend_bytes)))
+    return offset
+
+
+def read_maze_header(file):
+    """Lê o cabeçalho do formato binário: dict com dims, start, end, seed, legenda e offset"""
+    data = file.read(_HEADER.size)
+    if len(data) < _HEADER.size or data[:4] != MAZE_MAGIC:
+        raise ValueError("arquivo não está no formato binário de maze")
+    magic, version, flags, seed, rows, cols, sr, sc, er, ec, legend_size = _HEADER.unpack(data)
+    if version != MAZE_VERSION:
+        raise ValueError(f"versão de formato não suportada: {version}")
+    legend = list(file.read(legend_size).decode('utf-8'))
+    offset = -(-(_HEADER.size + legend_size) // MAZE_ALIGNMENT) * MAZE_ALIGNMENT
+    return {'rows': rows, 'cols': cols, 'start': (sr, sc), 'end': (er, ec),
+            'seed': seed if flags & _HAS_SEED else None, 'legend': legend, 'offset': offset}
+
+
 class Maze:
-    def __init__(self, rows, cols, obstacle_prob=0.2, seed=None, ensure_path=True):
+    # Quantos campos de distância (saída, carregadores...) ficam em cache
+    MAX_DISTANCE_FIELDS = 8
+
+    # Códigos uint8 das células (representação interna em self.cells)
+    CELL_FREE = 0
+    CELL_OBSTACLE = 1
+    CELL_WALL = 2
+    CELL_START = 3
+    CELL_END = 4
+    CELL_CHARS = np.array(['.', '#', '█', 'S', 'E'])
+    CELL_CODES = {'.': 0, '#': 1, '█': 2, 'S': 3, 'E': 4}
+    CELL_COSTS = np.array([1, 3, 0, 1, 1], dtype=np.int32)
+
+    def __init__(self, rows, cols, obstacle_prob=0.2, seed=None, ensure_path=True, compact=False):
+        """
+        compact=True guarda só os códigos uint8 (1 byte por célula); a visão em
+        caracteres (self.grid) é criada apenas quando alguém a usa
+        """
+        self._setup(rows, cols, seed, ensure_path, compact)
+        self.cells = np.full((rows, cols), self.CELL_FREE, dtype=np.uint8)
+        self.generate(obstacle_prob)
+
+    def _setup(self, rows, cols, seed, ensure_path, compact):
+        """Estado comum a mazes gerados e carregados de arquivo"""
         self.rows = rows
         self.cols = cols
         self.seed = seed
         self.ensure_path = ensure_path
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        self.compact = compact
+        # Gerador próprio da instância: nada de estado global (random.seed/np.random.seed),
+        # então mazes podem ser gerados em paralelo. Mesmo seed → mesmo labirinto
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
         
         self.FREE = '.'      # Espaço livre
         self.OBSTACLE = '#'  # Obstáculo
@@ -25,135 +216,303 @@ class Maze:
         self.START = 'S'     # Início
         self.END = 'E'       # Fim
         
-        self.grid = np.full((rows, cols), self.FREE, dtype=str)
+        self.cells = None
+        self._grid = None
         self.start = (0, 0)
         self.end = (rows - 1, cols - 1)
-        
-        self.generate(obstacle_prob)
+        self._adjacency = None
+        self._distance_fields = OrderedDict()
+        self.walls_removed = 0
 
     def generate(self, obstacle_prob=0.2):
         """Gera labirinto garantindo que sempre existe um caminho"""
-        if self.seed is not None:
-            random.seed(self.seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        self.cells[:] = self.CELL_FREE
         
         self.generate_obstacles(obstacle_prob)
         
         self.add_strategic_walls()
         
-        self.grid[self.start[0]][self.start[1]] = self.START
-        self.grid[self.end[0]][self.end[1]] = self.END
+        self.cells[self.start] = self.CELL_START
+        self.cells[self.end] = self.CELL_END
         
         if self.ensure_path:
             self.ensure_connectivity()
         
+        # Grade nova: adjacência e campos de distância serão refeitos no próximo uso
+        self._adjacency = None
+        self._distance_fields.clear()
+        self._grid = None
+        if self.compact:
+            return self.cells
         return self.grid
+
+    @classmethod
+    def _from_cells(cls, cells, start, end, seed=None):
+        """Maze pronto a partir de códigos já existentes (sem gerar nada)"""
+        rows, cols = cells.shape
+        maze = cls.__new__(cls)
+        maze._setup(rows, cols, seed, ensure_path=False, compact=True)
+        maze.cells = cells
+        maze.start = start
+        maze.end = end
+        return maze
+
+    def save(self, path):
+        """Salva no formato binário (cabeçalho + células uint8 cruas)"""
+        with open(path, 'wb') as file:
+            write_maze_header(file, self.rows, self.cols, self.start, self.end, self.seed, self.CELL_CHARS)
+            np.ascontiguousarray(self.cells, dtype=np.uint8).tofile(file)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Abre um maze salvo com save() ou um mapa ASCII (como o de game.py)
+        No formato binário as células são mapeadas com np.memmap (cópia na
+        escrita): abrir é instantâneo e as páginas são lidas sob demanda.
+        set_cell altera só a memória, nunca o arquivo
+        """
+        with open(path, 'rb') as file:
+            if file.read(len(MAZE_MAGIC)) != MAZE_MAGIC:
+                file.seek(0)
+                return cls.from_ascii(file.read().decode('utf-8'))
+            file.seek(0)
+            header = read_maze_header(file)
+
+        shape = (header['rows'], header['cols'])
+        if mmap:
+            cells = np.memmap(path, dtype=np.uint8, mode='c', offset=header['offset'], shape=shape)
+        else:
+            cells = np.fromfile(path, dtype=np.uint8, offset=header['offset'],
+                                count=shape[0] * shape[1]).reshape(shape)
+        if header['legend'] != list(cls.CELL_CHARS):
+            # Arquivo com outra numeração: traduz para os códigos atuais
+            cells = cls._codes_of(header['legend'])[cells]
+        return cls._from_cells(cells, header['start'], header['end'], header['seed'])
+
+    @classmethod
+    def _codes_of(cls, chars):
+        """Códigos uint8 de uma sequência de caracteres de célula"""
+        unknown = set(chars) - set(cls.CELL_CODES)
+        if unknown:
+            raise ValueError(f"caracteres de célula desconhecidos: {sorted(unknown)}")
+        return np.array([cls.CELL_CODES[ch] for ch in chars], dtype=np.uint8)
+
+    @classmethod
+    def from_ascii(cls, text):
+        """
+        Cria um maze a partir de um mapa ASCII: uma linha por fileira, células
+        separadas por espaço (formato de game.py) ou coladas ("S..█#")
+        start/end vêm das células 'S'/'E' (padrão: cantos)
+        """
+        lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+        rows = [line.split() if ' ' in line else list(line) for line in lines]
+        if not rows or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("mapa ASCII vazio ou com linhas de tamanhos diferentes")
+        cells = cls._codes_of([ch for row in rows for ch in row]).reshape(len(rows), len(rows[0]))
+
+        def find(code, default):
+            found = np.argwhere(cells == code)
+            return tuple(int(v) for v in found[0]) if len(found) else default
+
+        return cls._from_cells(cells, find(cls.CELL_START, (0, 0)),
+                               find(cls.CELL_END, (len(rows) - 1, len(rows[0]) - 1)))
+
+    def to_ascii(self):
+        """Mapa ASCII no formato de game.py (lido de volta por from_ascii/load)"""
+        return '\n'.join(' '.join(self.CELL_CHARS[row]) for row in self.cells) + '\n'
+
+    @property
+    def grid(self):
+        """
+        Visão em caracteres das células (criada sob demanda no modo compacto)
+        Só leitura: é derivada de self.cells, alterações passam por set_cell
+        """
+        if self._grid is None:
+            self._grid = self.CELL_CHARS[self.cells]
+            self._grid.setflags(write=False)
+        return self._grid
+
     
+    def _protect_endpoints(self, mask):
+        """Remove start e end de uma máscara de células a alterar"""
+        mask[self.start] = False
+        mask[self.end] = False
+        return mask
+
     def generate_obstacles(self, obstacle_prob):
-        """Gera obstáculos aleatórios evitando start e end"""
-        for i in range(self.rows):
-            for j in range(self.cols):
-                # Não coloca obstáculo no start ou end
-                if (i, j) == self.start or (i, j) == self.end:
-                    continue
-                if random.random() < obstacle_prob:
-                    self.grid[i][j] = self.OBSTACLE
+        """Gera obstáculos aleatórios evitando start e end (máscara vetorizada)"""
+        mask = self.rng.random((self.rows, self.cols), dtype=np.float32) < obstacle_prob
+        self.cells[self._protect_endpoints(mask)] = self.CELL_OBSTACLE
 
     
     def add_strategic_walls(self):
         """Adiciona paredes estratégicas sem bloquear completamente"""
-
-        for j in range(0, self.cols, 3):  # A cada 3 posições
-            if j < self.cols and (0, j) != self.start:
-                self.grid[0][j] = self.WALL
-        
-        for j in range(1, self.cols, 3): 
-            if j < self.cols and (self.rows-1, j) != self.end:
-                self.grid[self.rows-1][j] = self.WALL
+        mask = np.zeros((self.rows, self.cols), dtype=bool)
+        mask[0, 0::3] = True                 # A cada 3 posições na primeira linha
+        mask[self.rows - 1, 1::3] = True     # Deslocado na última linha
+        mask[0::2, 0] = True                 # Linhas pares nas laterais
+        mask[0::2, self.cols - 1] = True
         
-        for i in range(0, self.rows, 2):
-            if i < self.rows and (i, 0) != self.start:
-                self.grid[i][0] = self.WALL
-            if i < self.rows and (i, self.cols-1) != self.end:
-                self.grid[i][self.cols-1] = self.WALL
+        if self.rows > 2 and self.cols > 2:
+            wall_count = max(1, (self.rows * self.cols) // 20)
+            rows = self.rng.integers(1, self.rows - 1, size=wall_count)
+            cols = self.rng.integers(1, self.cols - 1, size=wall_count)
+            mask[rows, cols] = True
         
-        wall_count = max(1, (self.rows * self.cols) // 20)
-        for _ in range(wall_count):
-            row = random.randint(1, self.rows-2)
-            col = random.randint(1, self.cols-2)
-            if (row, col) != self.start and (row, col) != self.end:
-                self.grid[row][col] = self.WALL
+        self.cells[self._protect_endpoints(mask)] = self.CELL_WALL
     
+    def cell_code(self, cell):
+        """Código uint8 de uma célula dada como caractere ou código"""
+        return self.CELL_CODES[cell] if isinstance(cell, str) else int(cell)
+
+    def cell_cost(self, cell):
+        """Custo de entrar em uma célula (0 = parede, intransponível)"""
+        return int(self.CELL_COSTS[self.cell_code(cell)])
+
+    def movement_costs(self):
+        """Matriz (rows, cols) com o custo de entrar em cada célula"""
+        return self.CELL_COSTS[self.cells]
+
+    @property
+    def adjacency(self):
+        """Tabela de adjacência construída uma única vez e compartilhada pelas buscas"""
+        if self._adjacency is None:
+            self._adjacency = GridAdjacency(self.movement_costs())
+        return self._adjacency
+
+    def set_cell(self, row, col, cell):
+        """Altera uma célula mantendo a tabela de adjacência e os campos de distância atualizados"""
+        code = self.cell_code(cell)
+        old_cost = self.cell_cost(self.cells[row, col])
+        new_cost = self.cell_cost(code)
+        self.cells[row, col] = code
+        if self._grid is not None:
+            self._grid.setflags(write=True)
+            self._grid[row, col] = self.CELL_CHARS[code]
+            self._grid.setflags(write=False)
+        if self._adjacency is not None:
+            self._adjacency.update_cell(row, col, new_cost)
+
+        if new_cost == old_cost or not self._distance_fields:
+            return
+        if new_cost == 0 or (old_cost != 0 and new_cost > old_cost):
+            # Célula ficou mais cara (ou virou parede): descarta os campos
+            self._distance_fields.clear()
+        else:
+            # Célula ficou mais barata: só distâncias podem diminuir, repara a partir dela
+            for target, field in self._distance_fields.items():
+                self._repair_distance_field(field, row * self.cols + col, target == (row, col))
+
+    def _propagate_distances(self, dist, heap):
+        """Dijkstra reverso: dist[v] = custo de v até o alvo (entrar em u custa cost(u))"""
+        adjacency = self.adjacency
+        indices = adjacency.indices_view
+        costs = adjacency.costs_view
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            next_d = d + costs[node]
+            base = node * 4
+            for k in range(base, base + 4):
+                neighbor = indices[k]
+                if neighbor >= 0 and (dist[neighbor] < 0 or next_d < dist[neighbor]):
+                    dist[neighbor] = next_d
+                    heapq.heappush(heap, (next_d, neighbor))
+
+    def _repair_distance_field(self, field, node, is_target=False):
+        """
+        Reparo incremental após uma célula ficar mais barata
+        is_target: a célula é o alvo do campo (ex.: parede que virou chão), distância 0
+        """
+        dist = memoryview(field.reshape(-1))
+        indices = self.adjacency.indices_view
+        costs = self.adjacency.costs_view
+        if is_target:
+            dist[node] = 0
+        elif dist[node] != 0:
+            base = node * 4
+            for k in range(base, base + 4):
+                neighbor = indices[k]
+                if neighbor >= 0 and dist[neighbor] >= 0:
+                    candidate = dist[neighbor] + costs[neighbor]
+                    if dist[node] < 0 or candidate < dist[node]:
+                        dist[node] = candidate
+        if dist[node] >= 0:
+            self._propagate_distances(dist, [(dist[node], node)])
+
+    def distance_field(self, target):
+        """
+        Campo de distâncias (Dijkstra reverso) de todas as células até target,
+        com o mesmo modelo de custo do A* (obstáculo = 3). -1 = inalcançável
+        Calculado sob demanda e mantido em cache LRU (MAX_DISTANCE_FIELDS)
+        """
+        field = self._distance_fields.get(target)
+        if field is not None:
+            self._distance_fields.move_to_end(target)
+            return field
+
+        field = np.full((self.rows, self.cols), -1, dtype=np.int32)
+        if self.cells[target] != self.CELL_WALL:
+            target_node = target[0] * self.cols + target[1]
+            dist = memoryview(field.reshape(-1))
+            dist[target_node] = 0
+            self._propagate_distances(dist, [(0, target_node)])
+
+        self._distance_fields[target] = field
+        while len(self._distance_fields) > self.MAX_DISTANCE_FIELDS:
+            self._distance_fields.popitem(last=False)
+        return field
+
+    def distance_to(self, pos, target):
+        """Custo do melhor caminho de pos até target (consulta O(1) ao campo)"""
+        d = self.distance_field(target)[pos[0]][pos[1]]
+        return float('inf') if d < 0 else int(d)
+
+    def next_step(self, pos, target):
+        """Próxima célula do melhor caminho de pos até target (None se já chegou ou não há caminho)"""
+        field = self.distance_field(target)
+        if pos == target or field[pos[0]][pos[1]] < 0:
+            return None
+        best, best_cost = None, None
+        for neighbor, cost in self.adjacency.neighbors(pos[0] * self.cols + pos[1]):
+            d = field.flat[neighbor]
+            if d >= 0 and (best_cost is None or d + cost < best_cost):
+                best, best_cost = neighbor, d + cost
+        return None if best is None else divmod(best, self.cols)
+
     def is_valid_pos(self, row, col):
         """Verifica se a posição é válida - apenas paredes bloqueiam, obstáculos são transitáveis"""
         return (0 <= row < self.rows and 0 <= col < self.cols and 
-                self.grid[row][col] != self.WALL)
+                self.cells[row, col] != self.CELL_WALL)
     
     def ensure_connectivity(self):
         """Verifica conectividade - obstáculos são transitáveis, apenas paredes bloqueiam"""
-        # BFS considerando que obstáculos são transitáveis (custo maior)
-        visited = set()
-        queue = deque([self.start])
-        visited.add(self.start)
-        
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        
-        while queue:
-            row, col = queue.popleft()
-            
-            # Se chegou ao destino, há caminho
-            if (row, col) == self.end:
-                return True
-            
-            # Explora vizinhos - obstáculos são permitidos, apenas paredes bloqueiam
-            for dr, dc in directions:
-                new_row, new_col = row + dr, col + dc
-                
-                if ((new_row, new_col) not in visited and 
-                    self.is_valid_pos(new_row, new_col)):
-                    visited.add((new_row, new_col))
-                    queue.append((new_row, new_col))
+        # Rotulagem vetorizada das componentes (obstáculos contam como transitáveis)
+        passable = self.cells != self.CELL_WALL
+        labels = label_components(passable)
+        if labels[self.start] == labels[self.end]:
+            self.walls_removed = 0
+            return True
         
-        # Se não encontrou caminho, é porque há paredes bloqueando
+        # Se não há caminho, é porque há paredes bloqueando
         print("🔧 Caminho bloqueado por paredes, criando abertura...")
-        self._create_guaranteed_path()
+        self._create_guaranteed_path(passable, labels)
         return True
     
-    def _create_guaranteed_path(self):
-        """Cria um caminho garantido removendo apenas paredes (obstáculos são transitáveis)"""
-        # Remove apenas paredes para garantir conectividade (obstáculos podem ser atravessados)
-        current_row, current_col = self.start
-        target_row, target_col = self.end
-        
-        # Movimento horizontal primeiro
-        while current_col != target_col:
-            if current_col < target_col:
-                current_col += 1
-            else:
-                current_col -= 1
-            
-            # Remove apenas paredes (obstáculos são mantidos pois são transitáveis)
-            if self.grid[current_row][current_col] in [self.WALL]:
-                self.grid[current_row][current_col] = self.FREE
-        
-        # Movimento vertical depois
-        while current_row != target_row:
-            if current_row < target_row:
-                current_row += 1
-            else:
-                current_row -= 1
-            
-            # Remove apenas paredes (obstáculos são mantidos pois são transitáveis)
-            if self.grid[current_row][current_col] in [self.WALL]:
-                self.grid[current_row][current_col] = self.FREE
-        
-        # Garante que start e end estão corretos
-        self.grid[self.start[0]][self.start[1]] = self.START
-        self.grid[self.end[0]][self.end[1]] = self.END
+    def _create_guaranteed_path(self, passable, labels):
+        """Cria um caminho garantido removendo o menor número possível de paredes"""
+        removed = min_wall_repair(passable, self.start, self.end, labels)
+        for row, col in removed:
+            self.cells[row, col] = self.CELL_FREE
+        self.walls_removed = len(removed)
     
     def display(self):
         """Exibe o labirinto de forma legível"""
-        for row in self.grid:
-            print(' '.join(row))
+        # Converte linha a linha: não materializa a visão inteira no modo compacto
+        for row in self.cells:
+            print(' '.join(self.CELL_CHARS[row]))
         print()
     
     def calculate_cost_with_astar(self):
@@ -168,7 +527,8 @@ class Maze:
             print("Nenhum caminho encontrado")
             return [], float('inf')
     
-maze = Maze(10, 10, obstacle_prob=0.3, seed=76, ensure_path=True)
-maze.display()
+if __name__ == "__main__":
+    maze = Maze(10, 10, obstacle_prob=0.3, seed=76, ensure_path=True)
+    maze.display()
 
-maze.calculate_cost_with_astar()
+    maze.calculate_cost_with_astar()
@@ -0,0 +1,117 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from aStar import AStar
+from maze import Maze
+
+SEEDS = range(8)
+
+
+def make_maze(size=15, seed=0, obstacle_prob=0.3):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Maze(size, size, obstacle_prob=obstacle_prob, seed=seed)
+
+
+def free_pairs(maze, count=12, seed=0):
+    """Pares (start, goal) de células de custo 1 (valem também para search_simple/JPS)"""
+    rng = random.Random(seed)
+    free = [(r, c) for r in range(maze.rows) for c in range(maze.cols)
+            if maze.cells[r, c] in (maze.CELL_FREE, maze.CELL_START, maze.CELL_END)]
+    return [(maze.start, maze.end)] + [(rng.choice(free), rng.choice(free)) for _ in range(count - 1)]
+
+
+def baseline(astar, start, goal, simple=False):
+    """AStar.search (ou search_simple) de start até goal"""
+    astar.start, astar.end = start, goal
+    return astar.search_simple() if simple else astar.search()
+
+
+def path_cost(astar, path, simple=False):
+    """Confere que o caminho é contínuo e transitável e devolve o seu custo"""
+    cost = 0
+    for prev, node in zip(path, path[1:]):
+        assert abs(prev[0] - node[0]) + abs(prev[1] - node[1]) == 1
+        code = astar.maze.cells[node]
+        assert code != Maze.CELL_WALL
+        if simple:
+            assert code != Maze.CELL_OBSTACLE
+        cost += astar.get_movement_cost(prev, node)
+    return cost
+
+
+def assert_same_result(result, expected, astar, start, goal, simple=False):
+    found, path, cost = result[:3]
+    assert found == expected[0]
+    if found:
+        assert cost == expected[2]
+        assert path[0] == start and path[-1] == goal
+        assert path_cost(astar, path, simple) == cost
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_search_array_matches_search(seed):
+    maze = make_maze(seed=seed)
+    astar = AStar(maze)
+    for start, goal in free_pairs(maze, seed=seed):
+        # O mesmo workspace é reaproveitado entre as consultas
+        result = astar.search_array(start, goal)
+        assert_same_result(result, baseline(astar, start, goal), astar, start, goal)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_search_bidirectional_matches_search(seed):
+    maze = make_maze(seed=seed)
+    astar = AStar(maze)
+    for start, goal in free_pairs(maze, seed=seed):
+        expected = baseline(astar, start, goal)
+        assert_same_result(astar.search_bidirectional(), expected, astar, start, goal)
+
+        expected = baseline(astar, start, goal, simple=True)
+        assert_same_result(astar.search_bidirectional(simple=True), expected, astar, start, goal, simple=True)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_search_jps_matches_search_simple(seed):
+    maze = make_maze(seed=seed)
+    astar = AStar(maze)
+    for start, goal in free_pairs(maze, seed=seed):
+        expected = baseline(astar, start, goal, simple=True)
+        assert_same_result(astar.search_jps(start, goal), expected, astar, start, goal, simple=True)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_search_nearest_finds_cheapest_goal(seed):
+    maze = make_maze(seed=seed)
+    astar = AStar(maze)
+    pairs = free_pairs(maze, seed=seed)
+    start = pairs[1][0]
+    goals = [goal for _, goal in pairs if goal != start]
+    costs = {goal: baseline(astar, start, goal)[2] for goal in goals}
+    reachable = {goal: cost for goal, cost in costs.items() if cost != float('inf')}
+
+    found, goal, path, cost, _ = astar.search_nearest(goals, start)
+    assert found == bool(reachable)
+    if found:
+        assert cost == min(reachable.values()) == costs[goal]
+        assert path[0] == start and path[-1] == goal
+        assert path_cost(astar, path) == cost
+
+
+def test_search_array_follows_set_cell():
+    maze = make_maze(seed=3, obstacle_prob=0)
+    astar = AStar(maze)
+    maze.set_cell(0, 1, maze.WALL)
+    maze.set_cell(1, 0, maze.OBSTACLE)
+    expected = baseline(astar, maze.start, maze.end)
+    assert_same_result(astar.search_array(maze.start, maze.end), expected, astar, maze.start, maze.end)
+
+
+def test_movement_cost_reads_cells():
+    maze = make_maze(size=3, obstacle_prob=0)
+    maze.set_cell(1, 1, maze.OBSTACLE)
+    astar = AStar(maze)
+    assert astar.get_movement_cost((0, 1), (1, 1)) == 3
+    assert astar.get_movement_cost((1, 1), (1, 2)) == 1
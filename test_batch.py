@@ -0,0 +1,24 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from aStar import AStar
+from batch import batch_search
+from maze import Maze
+
+
+@pytest.mark.parametrize('method', ['search_array', 'search_jps'])
+def test_batch_matches_serial_search(method):
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(30, 30, obstacle_prob=0.25, seed=4)
+    rng = random.Random(4)
+    free = [(r, c) for r in range(maze.rows) for c in range(maze.cols) if maze.cells[r, c] != maze.CELL_WALL]
+    queries = [(rng.choice(free), rng.choice(free)) for _ in range(60)]
+
+    results = dict(batch_search(maze, queries, workers=2, chunksize=16, method=method))
+    assert sorted(results) == list(range(len(queries)))
+    astar = AStar(maze)
+    for index, (start, goal) in enumerate(queries):
+        assert results[index] == getattr(astar, method)(start, goal)
@@ -0,0 +1,21 @@
+import json
+
+from corpus import build_corpus
+from maze import Maze
+
+
+def test_corpus_is_identical_for_any_worker_count(tmp_path):
+    options = dict(sizes=(8, 12), obstacle_probs=(0.2, 0.35), per_config=3, seed=7)
+    records = build_corpus(tmp_path / 'one', workers=1, **options)
+    again = build_corpus(tmp_path / 'two', workers=3, **options)
+    assert records == again
+    assert [record['index'] for record in records] == list(range(12))
+
+    for name in ['metadata.jsonl'] + [record['file'] for record in records]:
+        assert (tmp_path / 'one' / name).read_bytes() == (tmp_path / 'two' / name).read_bytes()
+
+    lines = (tmp_path / 'one' / 'metadata.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == records
+    maze = Maze.load(tmp_path / 'one' / records[5]['file'])
+    assert (maze.rows, maze.seed) == (records[5]['rows'], records[5]['seed'])
+    assert maze.calculate_cost_with_astar()[1] == records[5]['optimal_cost']
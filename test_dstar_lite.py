@@ -0,0 +1,65 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from aStar import AStar
+from dstar_lite import DStarLite
+from maze import Maze
+
+
+def make_maze(size=15, seed=0, obstacle_prob=0.3):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Maze(size, size, obstacle_prob=obstacle_prob, seed=seed)
+
+
+def path_cost(maze, path):
+    costs = maze.movement_costs()
+    for prev, node in zip(path, path[1:]):
+        assert abs(prev[0] - node[0]) + abs(prev[1] - node[1]) == 1
+        assert costs[node] > 0
+    return sum(int(costs[node]) for node in path[1:])
+
+
+def assert_matches_astar(dstar, maze, start):
+    """O caminho reparado custa o mesmo que um A* refeito do zero"""
+    found, _, cost, _ = AStar(maze).search_array(start, maze.end)
+    path = dstar.path()
+    assert (path is not None) == found
+    if found:
+        assert path[0] == start and path[-1] == maze.end
+        assert path_cost(maze, path) == cost
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_replanning_matches_astar_after_cell_changes(seed):
+    maze = make_maze(seed=seed)
+    dstar = DStarLite(maze.movement_costs(), maze.start, maze.end)
+    assert_matches_astar(dstar, maze, maze.start)
+
+    rng = random.Random(seed)
+    position = maze.start
+    for _ in range(10):
+        path = dstar.path()
+        if path and len(path) > 2:
+            # O robô anda um passo e descobre mudanças em células quaisquer
+            position = path[1]
+            dstar.move_to(position)
+        for _ in range(3):
+            row, col = rng.randrange(maze.rows), rng.randrange(maze.cols)
+            if (row, col) in (position, maze.end):
+                continue
+            maze.set_cell(row, col, rng.choice([maze.FREE, maze.OBSTACLE, maze.WALL]))
+            dstar.update_cell(row, col, maze.cell_cost(maze.cells[row, col]))
+        assert_matches_astar(dstar, maze, position)
+
+
+def test_blocked_goal_has_no_path():
+    maze = make_maze(size=5, obstacle_prob=0)
+    dstar = DStarLite(maze.movement_costs(), maze.start, maze.end)
+    assert dstar.path() is not None
+    for row, col in ((maze.rows - 2, maze.cols - 1), (maze.rows - 1, maze.cols - 2)):
+        maze.set_cell(row, col, maze.WALL)
+        dstar.update_cell(row, col, 0)
+    assert dstar.path() is None
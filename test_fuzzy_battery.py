@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import fuzzy_battery
+from fuzzy_battery import FALLBACK, PriorityTable, decide_goal, verify_table
+
+
+@pytest.fixture(scope='module')
+def table():
+    return fuzzy_battery.compiled_table()
+
+
+def test_table_is_exact_on_integer_points(table):
+    report = verify_table(table, samples=500, integer=True)
+    assert report['max_error'] <= 1e-9
+    assert report['nan_mismatches'] == 0
+    assert report['decision_mismatches'] == 0
+
+
+def test_scalar_decisions_match_decide_goal(table):
+    rng = np.random.default_rng(1)
+    for point in rng.integers(0, table.shape, (60, 3)):
+        point = [int(v) for v in point]
+        assert table.decide(*point) == decide_goal(*point)
+        assert decide_goal(*point, compiled=True) == decide_goal(*point)
+
+
+def test_nan_cells_follow_decide_goal(table):
+    cells = np.argwhere(np.isnan(table.values))
+    assert len(cells)
+    for b, c, g in cells[::len(cells) // 20]:
+        # No ponto inteiro o skfuzzy não tem saída: decide_goal responde FALLBACK
+        assert table.decide(int(b), int(c), int(g)) == decide_goal(int(b), int(c), int(g)) == FALLBACK
+        # Fora da grade o vizinho sem saída não decide nada: vale o decide_goal
+        point = (min(b + 0.3, table.shape[0] - 1), c + 0.2, g)
+        assert table.decide(*point) == decide_goal(*point)
+
+
+def test_vectorized_decide_matches_scalar(table):
+    rng = np.random.default_rng(2)
+    points = rng.uniform(0, np.array(table.shape) - 1, (200, 3))
+    points[:100] = np.round(points[:100])
+    decisions = table.decide(*points.T)
+    assert list(decisions) == [table.decide(*map(float, p)) for p in points]
+
+
+def test_lookup_and_interpolation_on_linear_surface():
+    # Superfície linear: a interpolação trilinear é exata e o modo padrão
+    # erra no máximo meio passo em cada eixo
+    b, c, g = np.meshgrid(np.arange(11), np.arange(6), np.arange(5), indexing='ij')
+    table = PriorityTable(2.0 * b + 3.0 * c + 5.0 * g)
+    points = np.random.default_rng(3).uniform(0, [10, 5, 4], (300, 3))
+    exact = points @ [2.0, 3.0, 5.0]
+
+    assert np.allclose(table.priority(*points.T, interpolate=True), exact)
+    assert np.abs(table.priority(*points.T) - exact).max() <= (2.0 + 3.0 + 5.0) / 2
+    for point, value in zip(points[:50], exact):
+        assert table.priority(*point, interpolate=True) == pytest.approx(value)
+        assert table.priority(*point) == table.priority(*np.floor(point + 0.5))
+    # Fora do universo: limitado às bordas
+    assert table.priority(-5, 99, 2) == table.priority(0, 5, 2)
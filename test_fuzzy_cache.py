@@ -0,0 +1,57 @@
+from fuzzy_cache import MemoCache
+
+
+def recorder():
+    calls = []
+
+    def func(*inputs):
+        calls.append(inputs)
+        return sum(inputs)
+
+    return func, calls
+
+
+def test_evaluates_at_quantized_point():
+    func, calls = recorder()
+    cache = MemoCache(func, quantum=5)
+    # 11 e 12 caem no mesmo balde (10): a ordem de chegada não muda o resultado
+    assert cache(12, 3) == cache(11, 4) == 15
+    assert calls == [(10, 5)]
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    per_input = MemoCache(func, quantum=(1, 10))
+    assert per_input(2.4, 14) == 2 + 10
+    assert per_input.key((2.4, 16)) == (2, 2)
+
+
+def test_lru_eviction():
+    func, calls = recorder()
+    cache = MemoCache(func, maxsize=2)
+    cache(1)
+    cache(2)
+    cache(1)      # 1 passa a ser o mais recente
+    cache(3)      # descarta 2
+    cache(1)
+    cache(2)
+    assert calls == [(1,), (2,), (3,), (2,)]
+    stats = cache.stats()
+    assert (stats['size'], stats['hits'], stats['misses'], stats['evictions']) == (2, 2, 4, 2)
+
+
+def test_trace_warms_a_new_cache(tmp_path):
+    func, _ = recorder()
+    cache = MemoCache(func, quantum=2, record=True)
+    for value in (1.2, 3.9, 1.0, 8.1):
+        cache(value, value)
+    path = tmp_path / 'trace.npy'
+    cache.save_trace(path)
+
+    warm_func, calls = recorder()
+    warmed = MemoCache(warm_func, quantum=2)
+    warmed.warm(MemoCache.load_trace(path))
+    assert warmed.warmed == 3 and len(calls) == 3
+    assert warmed(1.2, 1.2) == cache(1.2, 1.2)
+    assert (warmed.hits, warmed.misses) == (1, 0)
+
+    warmed.clear()
+    assert warmed.stats()['size'] == 0 and warmed.warmed == 0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import fuzzy
+from fuzzy_engine import input_grid
+from fuzzy_sampling import sample_pointwise
+
+
+@pytest.fixture(scope='module')
+def points():
+    """Pontos reais aleatórios mais uma grade que inclui as bordas dos universos"""
+    rng = np.random.default_rng(0)
+    grid = input_grid(fuzzy.steering_engine, 100.0)
+    return np.concatenate([grid[::7], rng.uniform(0, 200, (120, len(fuzzy.SENSORS)))])
+
+
+@pytest.fixture(scope='module')
+def reference(points):
+    return sample_pointwise(fuzzy.steering_ctrl, fuzzy.SENSORS, points, 'steering')
+
+
+def test_mamdani_matches_skfuzzy(points, reference):
+    actual = fuzzy.steering_engine.compute(points)
+    assert (np.isnan(actual) == np.isnan(reference)).all()
+    valid = ~np.isnan(reference)
+    assert valid.any()
+    assert np.abs(actual[valid] - reference[valid]).max() <= 1e-9
+
+
+def test_mamdani_rows_are_independent(points):
+    batch = fuzzy.steering_engine.compute(points)
+    single = np.array([fuzzy.steering_engine.compute(row[None])[0] for row in points[:40]])
+    assert np.array_equal(np.isnan(single), np.isnan(batch[:40]))
+    assert np.allclose(single, batch[:40], equal_nan=True)
+
+
+def test_sugeno_error_is_bounded(points, reference):
+    sugeno = fuzzy.steering_sugeno
+    actual = sugeno.compute(points)
+    # Onde nenhuma regra dispara os dois dão NaN
+    assert (np.isnan(actual) == np.isnan(reference)).all()
+    valid = ~np.isnan(reference)
+    # Mesma tolerância declarada em fuzzy_harness (engine 'sugeno')
+    assert np.abs(actual[valid] - reference[valid]).max() <= 3.0
+
+
+def test_sugeno_compute_one_matches_compute(points):
+    sugeno = fuzzy.steering_sugeno
+    batch = sugeno.compute(points)
+    single = np.array([sugeno.compute_one(row) for row in points])
+    assert np.allclose(single, batch, atol=1e-9, equal_nan=True)
+
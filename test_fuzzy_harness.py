@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+
+from fuzzy_harness import Controller, Engine, check, sample_points
+
+UNIVERSES = [np.arange(0, 11), np.arange(0, 6)]
+
+
+def reference(x):
+    # Sem saída (NaN) quando as duas entradas são pequenas
+    return np.where(x.sum(axis=1) < 1.5, np.nan, 10 * x[:, 0] + x[:, 1])
+
+
+def numeric_controller():
+    return Controller('soma', ('a', 'b'), UNIVERSES, 'digest', reference,
+                      lambda value: 0.0 if math.isnan(value) else value, 0.0, {})
+
+
+def decision_controller():
+    return Controller('decisão', ('a', 'b'), UNIVERSES, 'digest', reference,
+                      lambda value: "alto" if value >= 50 else "baixo", "baixo", {})
+
+
+def run_check(controller, engine):
+    x, on_grid = sample_points(controller.universes, grid_points=4, random_samples=200)
+    return check(controller, engine, x, controller.reference(x), on_grid)
+
+
+def test_engine_within_tolerance_passes():
+    report = run_check(numeric_controller(), Engine(None, lambda x: reference(x) + 0.4, tolerance=0.5))
+    assert report['passed'] and report['failures'] == 0
+    assert report['fallback_points'] > 0
+
+
+def test_single_point_over_tolerance_fails():
+    def batch(x):
+        values = reference(x)
+        values[np.flatnonzero(~np.isnan(values))[7]] += 0.6
+        return values
+
+    report = run_check(numeric_controller(), Engine(None, batch, tolerance=0.5))
+    assert not report['passed'] and report['failures'] == 1
+
+
+def test_nan_mismatch_fails_even_within_tolerance():
+    def batch(x):
+        # 0 é a saída de fallback: cai dentro da tolerância, mas o NaN sumiu
+        return np.where(np.isnan(reference(x)), 0.0, reference(x))
+
+    report = run_check(numeric_controller(), Engine(None, batch, tolerance=100.0))
+    assert not report['passed']
+    assert report['fallback_failures'] == report['fallback_points'] > 0
+
+
+def test_any_decision_flip_fails():
+    controller = decision_controller()
+
+    def decide(a, b):
+        return controller.output(reference(np.array([[a, b]]))[0])
+
+    assert run_check(controller, Engine(decide))['passed']
+
+    def flipped(a, b):
+        return "alto" if (a, b) == (0.0, 5.0) else decide(a, b)
+
+    report = run_check(controller, Engine(flipped))
+    assert not report['passed'] and report['failures'] == report['grid_failures'] == 1
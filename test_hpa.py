@@ -0,0 +1,69 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from aStar import AStar
+from hpa import HierarchicalAStar
+from maze import Maze
+
+
+def make_maze(size=40, seed=0, obstacle_prob=0.25):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Maze(size, size, obstacle_prob=obstacle_prob, seed=seed)
+
+
+def random_pairs(maze, count=15, seed=0):
+    rng = random.Random(seed)
+    free = [(r, c) for r in range(maze.rows) for c in range(maze.cols) if maze.cells[r, c] != maze.CELL_WALL]
+    return [(maze.start, maze.end)] + [(rng.choice(free), rng.choice(free)) for _ in range(count - 1)]
+
+
+def path_cost(maze, path):
+    costs = maze.movement_costs()
+    for prev, node in zip(path, path[1:]):
+        assert abs(prev[0] - node[0]) + abs(prev[1] - node[1]) == 1
+        assert costs[node] > 0
+    return sum(int(costs[node]) for node in path[1:])
+
+
+def assert_valid(hpa, astar, maze, pairs, exact=False):
+    for start, goal in pairs:
+        found, path, cost, _ = hpa.search(start, goal)
+        expected = astar.search_array(start, goal)
+        # As entradas restringem os cruzamentos, mas não a conectividade
+        assert found == expected[0]
+        if found:
+            assert path[0] == start and path[-1] == goal
+            assert path_cost(maze, path) == cost
+            assert cost == expected[2] if exact else cost >= expected[2]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_search_is_complete_and_never_beats_astar(seed):
+    maze = make_maze(seed=seed)
+    assert_valid(HierarchicalAStar(maze, cluster_size=8), AStar(maze), maze, random_pairs(maze, seed=seed))
+
+
+def test_single_cluster_is_exact():
+    maze = make_maze(size=20, seed=5)
+    hpa = HierarchicalAStar(maze, cluster_size=20)
+    assert_valid(hpa, AStar(maze), maze, random_pairs(maze, seed=5), exact=True)
+
+
+def test_update_cell_matches_rebuilt_hierarchy():
+    maze = make_maze(seed=7)
+    hpa = HierarchicalAStar(maze, cluster_size=8)
+    rng = random.Random(7)
+    for _ in range(30):
+        row, col = rng.randrange(maze.rows), rng.randrange(maze.cols)
+        maze.set_cell(row, col, rng.choice([maze.FREE, maze.OBSTACLE, maze.WALL]))
+        hpa.update_cell(row, col)
+
+    rebuilt = HierarchicalAStar(maze, cluster_size=8)
+    assert hpa.borders == rebuilt.borders
+    assert hpa.intra_edges == rebuilt.intra_edges
+    pairs = random_pairs(maze, seed=7)
+    assert [hpa.search(s, g)[2] for s, g in pairs] == [rebuilt.search(s, g)[2] for s, g in pairs]
+    assert_valid(hpa, AStar(maze), maze, pairs)
@@ -0,0 +1,147 @@
+import collections
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from maze import Maze, label_components, min_wall_repair, write_maze_header
+
+
+def make_maze(rows=5, cols=5, seed=1):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Maze(rows, cols, obstacle_prob=0, seed=seed)
+
+
+def test_distance_field_repaired_when_wall_target_becomes_floor():
+    maze = make_maze()
+    maze.set_cell(2, 2, '█')
+    assert maze.distance_to((2, 1), (2, 2)) == float('inf')
+
+    maze.set_cell(2, 2, '.')
+    assert maze.distance_to((2, 1), (2, 2)) == 1
+    # O campo reparado é igual ao recalculado do zero
+    repaired = maze.distance_field((2, 2)).copy()
+    maze._distance_fields.clear()
+    assert (maze.distance_field((2, 2)) == repaired).all()
+
+
+def flood(passable, start):
+    """Células alcançáveis a partir de start (referência simples, sem NumPy)"""
+    rows, cols = passable.shape
+    seen, stack = {start}, [start]
+    while stack:
+        row, col = stack.pop()
+        for n_row, n_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= n_row < rows and 0 <= n_col < cols and passable[n_row, n_col] and (n_row, n_col) not in seen:
+                seen.add((n_row, n_col))
+                stack.append((n_row, n_col))
+    return seen
+
+
+def fewest_walls(passable, start, end):
+    """BFS 0-1 de referência: menor número de paredes atravessadas de start até end"""
+    rows, cols = passable.shape
+    best = {start: 0}
+    queue = collections.deque([start])
+    while queue:
+        row, col = queue.popleft()
+        for node in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if not (0 <= node[0] < rows and 0 <= node[1] < cols):
+                continue
+            cost = best[(row, col)] + (0 if passable[node] else 1)
+            if cost < best.get(node, float('inf')):
+                best[node] = cost
+                if passable[node]:
+                    queue.appendleft(node)
+                else:
+                    queue.append(node)
+    return best[end]
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_label_components_matches_flood_fill(seed):
+    passable = np.random.default_rng(seed).random((7, 9)) < 0.55
+    labels = label_components(passable)
+    for row, col in zip(*np.nonzero(passable)):
+        component = flood(passable, (row, col))
+        assert {tuple(c) for c in np.argwhere(labels == labels[row, col])} == component
+        assert labels[row, col] == min(r * passable.shape[1] + c for r, c in component)
+    assert (labels[~passable] == -1).all()
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_min_wall_repair_removes_fewest_walls(seed):
+    passable = np.random.default_rng(seed).random((6, 8)) < 0.45
+    start, end = (0, 0), (5, 7)
+    passable[start] = passable[end] = True
+
+    removed = min_wall_repair(passable, start, end)
+    assert len(removed) == fewest_walls(passable, start, end)
+    assert all(not passable[cell] for cell in removed)
+    repaired = passable.copy()
+    for cell in removed:
+        repaired[cell] = True
+    assert end in flood(repaired, start)
+
+
+def test_generated_maze_is_connected():
+    for seed in range(10):
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze = Maze(20, 20, obstacle_prob=0.3, seed=seed)
+        assert maze.end in flood(maze.cells != Maze.CELL_WALL, maze.start)
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load_round_trip(tmp_path, mmap):
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(13, 17, obstacle_prob=0.3, seed=42)
+    path = tmp_path / 'maze.maze'
+    maze.save(path)
+
+    loaded = Maze.load(path, mmap=mmap)
+    assert (loaded.cells == maze.cells).all()
+    assert (loaded.start, loaded.end, loaded.seed) == (maze.start, maze.end, maze.seed)
+    assert (loaded.grid == maze.grid).all()
+    assert loaded.calculate_cost_with_astar() == maze.calculate_cost_with_astar()
+
+    # set_cell altera só a memória, nunca o arquivo
+    loaded.set_cell(1, 1, maze.WALL)
+    assert (Maze.load(path).cells == maze.cells).all()
+
+
+def test_load_translates_other_legend(tmp_path):
+    maze = Maze.from_ascii("S.#\n█..\n.#E")
+    legend = ['E', 'S', '█', '#', '.']
+    path = tmp_path / 'maze.maze'
+    with open(path, 'wb') as file:
+        write_maze_header(file, maze.rows, maze.cols, maze.start, maze.end, None, legend)
+        codes = {ch: code for code, ch in enumerate(legend)}
+        np.array([codes[ch] for ch in maze.grid.ravel()], dtype=np.uint8).tofile(file)
+
+    loaded = Maze.load(path)
+    assert (loaded.cells == maze.cells).all()
+    assert loaded.seed is None
+
+
+def test_ascii_round_trip(tmp_path):
+    text = "S . # .\n. █ █ .\n# . . E\n"
+    maze = Maze.from_ascii(text)
+    assert (maze.start, maze.end) == ((0, 0), (2, 3))
+    assert maze.to_ascii() == text
+    assert (Maze.from_ascii("S.#.\n.██.\n#..E").cells == maze.cells).all()
+
+    path = tmp_path / 'map.txt'
+    path.write_text(text, encoding='utf-8')
+    assert (Maze.load(path).cells == maze.cells).all()
+
+    with pytest.raises(ValueError):
+        Maze.from_ascii("S.x\n..E")
+
+
+def test_grid_is_read_only_view_of_cells():
+    maze = make_maze()
+    with pytest.raises(ValueError):
+        maze.grid[1, 1] = maze.WALL
+    maze.set_cell(1, 1, maze.WALL)
+    assert maze.grid[1, 1] == maze.WALL and maze.cells[1, 1] == Maze.CELL_WALL
@@ -0,0 +1,61 @@
+import math
+import os
+
+import numpy as np
+
+from maze import Maze
+from sensors import GridRaycaster, cast_batch, march
+
+TILE = 100
+GAME_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps", "game.txt")
+
+
+def game_grid():
+    return [list(row) for row in Maze.load(GAME_MAP).grid]
+
+
+def test_ray_grazing_a_wall_corner_stops_at_the_corner():
+    # O raio cruza y=800 em x≈199.95, dentro da parede (8, 1); a marcha passa
+    # na diagonal de (1, 7) para (2, 8) e lê o alcance inteiro
+    grid = game_grid()
+    x, y, a = 196.0, 785.5, 4.977
+    dx, dy = math.cos(a), -math.sin(a)
+    assert grid[8][1] == '█' and grid[8][2] != '█'
+    assert march(grid, TILE, x, y, dx, dy, 200) == 200
+
+    raycaster = GridRaycaster(grid, TILE)
+    hit = (800 - y) / dy
+    assert math.isclose(raycaster.cast(x, y, dx, dy, 200), hit)
+    heading = math.degrees(a)
+    batch = cast_batch(raycaster.mask, TILE, [(x, y, heading)], [0], 200)
+    assert math.isclose(batch[0, 0], hit)
+
+
+def test_axis_aligned_rays_match_the_pixel_march():
+    # Sem quinas no caminho a marcha fica no máximo 1px além do impacto exato
+    # (2px saindo do mapa pela esquerda ou por cima: int() trunca para zero)
+    grid = game_grid()
+    raycaster = GridRaycaster(grid, TILE)
+    rng = np.random.default_rng(0)
+    free = np.argwhere(~raycaster.mask)
+    for row, col in free[rng.integers(len(free), size=200)]:
+        x, y = (col + rng.random()) * TILE, (row + rng.random()) * TILE
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            exact = raycaster.cast(x, y, dx, dy, 200)
+            assert 0 <= march(grid, TILE, x, y, dx, dy, 200) - exact < 2
+
+
+def test_batch_matches_single_casts():
+    grid = game_grid()
+    raycaster = GridRaycaster(grid, TILE)
+    rows, cols = raycaster.mask.shape
+    rng = np.random.default_rng(1)
+    # Inclui poses dentro de paredes e fora do mapa (leitura 0)
+    poses = np.column_stack([rng.uniform(-50, cols * TILE + 50, 300),
+                             rng.uniform(-50, rows * TILE + 50, 300),
+                             rng.uniform(0, 360, 300)])
+    angles = [0, -45, 45, -90, 90]
+    batch = raycaster.sense_batch(poses, angles, 200, chunk=64)
+    single = np.array([raycaster.sense(x, y, heading, angles, 200) for x, y, heading in poses])
+    assert np.allclose(batch, single, rtol=0, atol=1e-9)
+    assert (batch == 0).any() and (batch == 200).any()
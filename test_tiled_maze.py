@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from maze import Maze, label_components
+from tiled_maze import TiledMaze
+
+
+def make_world(seed=3, max_tiles=64):
+    return TiledMaze(50, 70, tile_size=16, obstacle_prob=0.3, seed=seed, max_tiles=max_tiles)
+
+
+def test_tiles_depend_only_on_seed_and_position():
+    world = make_world()
+    # Ordem de geração diferente e cache mínimo: tiles refeitos são idênticos
+    other = make_world(max_tiles=1)
+    for tile_y in reversed(range(world.tile_rows)):
+        for tile_x in reversed(range(world.tile_cols)):
+            other.tile(tile_y, tile_x)
+    for tile_y in range(world.tile_rows):
+        for tile_x in range(world.tile_cols):
+            assert (world.tile(tile_y, tile_x) == other.tile(tile_y, tile_x)).all()
+    assert len(other._tiles) == 1
+
+    assert not (make_world(seed=4).window(0, 50, 0, 70) == world.window(0, 50, 0, 70)).all()
+
+
+def test_window_matches_cells_across_seams():
+    world = make_world()
+    full = world.window(0, world.rows, 0, world.cols)
+    assert full.shape == (world.rows, world.cols)
+    assert (world.window(10, 37, 5, 49) == full[10:37, 5:49]).all()
+    for row, col in [(0, 0), (15, 16), (16, 15), (49, 69), (31, 47)]:
+        assert world.cell(row, col) == full[row, col]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_start_reaches_end(seed):
+    world = make_world(seed=seed)
+    passable = world.window(0, world.rows, 0, world.cols) != Maze.CELL_WALL
+    labels = label_components(passable)
+    assert labels[world.start] == labels[world.end] != -1
+
+
+def test_save_matches_window(tmp_path):
+    world = make_world()
+    world.tile(1, 1)
+    path = tmp_path / 'world.maze'
+    world.save(path)
+    loaded = Maze.load(path)
+    assert (loaded.start, loaded.end, loaded.seed) == (world.start, world.end, world.seed)
+    assert np.array_equal(loaded.cells, world.window(0, world.rows, 0, world.cols))
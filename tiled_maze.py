@@ -0,0 +1,221 @@
+import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from maze import Maze, label_components, min_wall_repair, write_maze_header
+
+
+class TiledMaze:
+    """
+    Labirinto gerado em blocos (tiles), para mundos maiores que a memória
+
+    Cada tile é gerado de forma determinística só a partir de
+    (seed, tile_y, tile_x), em qualquer ordem e quantas vezes for preciso,
+    com as mesmas regras de Maze: obstáculos aleatórios, paredes
+    estratégicas nas bordas do mundo (em coordenadas globais, então o padrão
+    continua através das emendas) e paredes internas aleatórias.
+
+    Conectividade: no meio de cada emenda entre dois tiles há um portal (uma
+    célula livre de cada lado). Com ensure_path, cada tile remove o menor
+    número de paredes para ligar os seus portais (e start/end, se estiverem
+    nele). Assim a grade de tiles fica conectada e start sempre alcança end,
+    sem nunca olhar para fora do tile.
+
+    Só max_tiles tiles ficam residentes (cache LRU); os outros são refeitos
+    quando voltam a ser pedidos.
+    """
+
+    def __init__(self, rows, cols, tile_size=1024, obstacle_prob=0.2, seed=None,
+                 ensure_path=True, max_tiles=64):
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+        self.obstacle_prob = obstacle_prob
+        self.seed = seed
+        self.ensure_path = ensure_path
+        self.max_tiles = max_tiles
+        self.tile_rows = (rows + tile_size - 1) // tile_size
+        self.tile_cols = (cols + tile_size - 1) // tile_size
+        self.start = (0, 0)
+        self.end = (rows - 1, cols - 1)
+        # seed=None sorteia a entropia uma vez: o mundo continua consistente entre tiles
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+        self._tiles = OrderedDict()
+        self.tiles_generated = 0
+
+    def tile_bounds(self, tile_y, tile_x):
+        """(r0, r1, c0, c1) do tile em coordenadas globais"""
+        r0 = tile_y * self.tile_size
+        c0 = tile_x * self.tile_size
+        return r0, min(r0 + self.tile_size, self.rows), c0, min(c0 + self.tile_size, self.cols)
+
+    def tile_of(self, row, col):
+        return row // self.tile_size, col // self.tile_size
+
+    def tile_rng(self, tile_y, tile_x):
+        """Gerador do tile: depende só da seed do mundo e da posição do tile"""
+        return np.random.default_rng(np.random.SeedSequence([self.seed_sequence.entropy, tile_y, tile_x]))
+
+    def portals(self, tile_y, tile_x):
+        """Células de portal (globais) do lado deste tile em cada emenda"""
+        r0, r1, c0, c1 = self.tile_bounds(tile_y, tile_x)
+        mid_row = r0 + (r1 - r0) // 2
+        mid_col = c0 + (c1 - c0) // 2
+        cells = []
+        if tile_y > 0:
+            cells.append((r0, mid_col))
+        if tile_y < self.tile_rows - 1:
+            cells.append((r1 - 1, mid_col))
+        if tile_x > 0:
+            cells.append((mid_row, c0))
+        if tile_x < self.tile_cols - 1:
+            cells.append((mid_row, c1 - 1))
+        return cells
+
+    def tile(self, tile_y, tile_x):
+        """Códigos uint8 do tile (do cache ou gerados na hora)"""
+        key = (tile_y, tile_x)
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+        cells = self._generate_tile(tile_y, tile_x)
+        self._tiles[key] = cells
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return cells
+
+    def _generate_tile(self, tile_y, tile_x):
+        """Mesma sequência de Maze.generate, restrita ao tile"""
+        rng = self.tile_rng(tile_y, tile_x)
+        r0, r1, c0, c1 = self.tile_bounds(tile_y, tile_x)
+        height, width = r1 - r0, c1 - c0
+        cells = np.full((height, width), Maze.CELL_FREE, dtype=np.uint8)
+
+        # Células que precisam ficar livres: start, end e os portais do tile
+        keep = [(row, col) for row, col in [self.start, self.end] if r0 <= row < r1 and c0 <= col < c1]
+        if self.ensure_path:
+            keep += self.portals(tile_y, tile_x)
+        keep = [(row - r0, col - c0) for row, col in keep]
+
+        def protect(mask):
+            for cell in keep:
+                mask[cell] = False
+            return mask
+
+        cells[protect(rng.random((height, width), dtype=np.float32) < self.obstacle_prob)] = Maze.CELL_OBSTACLE
+
+        # Paredes estratégicas das bordas do mundo, em coordenadas globais
+        mask = np.zeros((height, width), dtype=bool)
+        global_rows = np.arange(r0, r1)
+        global_cols = np.arange(c0, c1)
+        if r0 == 0:
+            mask[0, global_cols % 3 == 0] = True
+        if r1 == self.rows:
+            mask[-1, global_cols % 3 == 1] = True
+        if c0 == 0:
+            mask[global_rows % 2 == 0, 0] = True
+        if c1 == self.cols:
+            mask[global_rows % 2 == 0, -1] = True
+
+        # Paredes internas aleatórias (fora das bordas do mundo), na mesma densidade de Maze
+        row_lo, row_hi = max(r0, 1), min(r1, self.rows - 1)
+        col_lo, col_hi = max(c0, 1), min(c1, self.cols - 1)
+        if row_lo < row_hi and col_lo < col_hi:
+            wall_count = max(1, (height * width) // 20)
+            wall_rows = rng.integers(row_lo, row_hi, size=wall_count) - r0
+            wall_cols = rng.integers(col_lo, col_hi, size=wall_count) - c0
+            mask[wall_rows, wall_cols] = True
+        cells[protect(mask)] = Maze.CELL_WALL
+
+        if r0 <= self.start[0] < r1 and c0 <= self.start[1] < c1:
+            cells[self.start[0] - r0, self.start[1] - c0] = Maze.CELL_START
+        if r0 <= self.end[0] < r1 and c0 <= self.end[1] < c1:
+            cells[self.end[0] - r0, self.end[1] - c0] = Maze.CELL_END
+
+        if self.ensure_path and len(keep) > 1:
+            self._connect(cells, keep)
+        self.tiles_generated += 1
+        return cells
+
+    @staticmethod
+    def _connect(cells, targets):
+        """Liga todos os alvos à componente do primeiro, removendo o mínimo de paredes"""
+        passable = cells != Maze.CELL_WALL
+        labels = label_components(passable)
+        anchor = targets[0]
+        for target in targets[1:]:
+            if labels[target] == labels[anchor]:
+                continue
+            for cell in min_wall_repair(passable, anchor, target, labels):
+                cells[cell] = Maze.CELL_FREE
+                passable[cell] = True
+            labels = label_components(passable)
+
+    def cell(self, row, col):
+        """Código da célula (row, col) do mundo"""
+        tile_y, tile_x = self.tile_of(row, col)
+        return int(self.tile(tile_y, tile_x)[row - tile_y * self.tile_size, col - tile_x * self.tile_size])
+
+    def window(self, r0, r1, c0, c1):
+        """Códigos uint8 da região [r0, r1) x [c0, c1), montada a partir dos tiles"""
+        out = np.empty((r1 - r0, c1 - c0), dtype=np.uint8)
+        size = self.tile_size
+        for tile_y in range(r0 // size, (r1 - 1) // size + 1):
+            for tile_x in range(c0 // size, (c1 - 1) // size + 1):
+                tr0, tr1, tc0, tc1 = self.tile_bounds(tile_y, tile_x)
+                lo_r, hi_r = max(r0, tr0), min(r1, tr1)
+                lo_c, hi_c = max(c0, tc0), min(c1, tc1)
+                out[lo_r - r0:hi_r - r0, lo_c - c0:hi_c - c0] = \
+                    self.tile(tile_y, tile_x)[lo_r - tr0:hi_r - tr0, lo_c - tc0:hi_c - tc0]
+        return out
+
+    def save(self, path):
+        """
+        Grava o mundo no formato binário de Maze.save, tile a tile: as células
+        vão direto para um np.memmap do arquivo, sem montar a grade inteira
+        (os tiles gravados não entram no cache)
+        """
+        with open(path, 'wb') as file:
+            offset = write_maze_header(file, self.rows, self.cols, self.start, self.end,
+                                       self.seed, Maze.CELL_CHARS)
+            file.truncate(offset + self.rows * self.cols)
+
+        out = np.memmap(path, dtype=np.uint8, mode='r+', offset=offset, shape=(self.rows, self.cols))
+        for tile_y in range(self.tile_rows):
+            for tile_x in range(self.tile_cols):
+                r0, r1, c0, c1 = self.tile_bounds(tile_y, tile_x)
+                cells = self._tiles.get((tile_y, tile_x))
+                out[r0:r1, c0:c1] = self._generate_tile(tile_y, tile_x) if cells is None else cells
+            out.flush()
+        del out
+
+
+def benchmark(size=4096, tile_size=1024, seed=0, path=None):
+    """
+    Tempo para gerar e gravar um mundo size x size tile a tile
+    Sem path, grava num diretório temporário, apagado no final
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = path or os.path.join(temp_dir, "tiled_maze.maze")
+        world = TiledMaze(size, size, tile_size=tile_size, seed=seed)
+        t0 = time.perf_counter()
+        world.save(path)
+        elapsed = time.perf_counter() - t0
+        print(f"{size}x{size} em tiles de {tile_size}: {elapsed:.1f}s "
+              f"({world.tiles_generated} tiles, {size * size / elapsed / 1e6:.1f} M células/s)")
+
+        t0 = time.perf_counter()
+        loaded = Maze.load(path)
+        print(f"Maze.load: {(time.perf_counter() - t0) * 1000:.2f}ms, "
+              f"start={loaded.start} end={loaded.end}")
+        # Solta o memmap antes de apagar o diretório
+        del loaded
+
+
+if __name__ == "__main__":
+    benchmark()